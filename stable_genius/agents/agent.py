@@ -44,7 +44,7 @@ class Agent:
         
         if hero_trope and hero_description:
             # Generate principles based on hero trope
-            psyche.interior["principles"] = f"I am {hero_trope.lower()} - {hero_description}"
+            psyche.update_interior_principles(f"I am {hero_trope.lower()} - {hero_description}")
             
             # Generate summary combining hero identity, hidden flaws, and premise interpretation
             summary_parts = [f"I see myself as {hero_trope.lower()} who {hero_description}"]
@@ -99,11 +99,13 @@ class Agent:
                     else:
                         summary_parts.append(f"Deep down, {flaw_influences[0]} and {flaw_influences[1]}")
             
-            psyche.interior["summary"] = ". ".join(summary_parts) + "."
+            psyche.update_interior_summary(". ".join(summary_parts) + ".")
         else:
             # Fallback for agents without premise data
-            psyche.interior["principles"] = f"A {self.personality} individual navigating complex situations"
-            psyche.interior["summary"] = f"I approach life with a {self.personality} perspective, trying to do what seems right in each moment."
+            psyche.update_interior(
+                summary=f"I approach life with a {self.personality} perspective, trying to do what seems right in each moment.",
+                principles=f"A {self.personality} individual navigating complex situations"
+            )
     
     def get_psyche(self):
         """Get the current psyche state"""
@@ -132,8 +134,8 @@ class Agent:
         psyche = Psyche.load(self.name)
         
         # Add the sender to relationships if not already present
-        if sender and sender not in psyche.relationships:
-            psyche.relationships[sender] = {"familiarity": 0}
+        if sender:
+            psyche.add_relationship(sender)
             
         observation = f"{sender + ': ' if sender else ''}{message}"
         
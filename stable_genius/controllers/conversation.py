@@ -308,9 +308,7 @@ async def process_agent_turn(agent, other_agent_name, message, agent_id, visuali
         logger.info(f"  \"{message_out}\"\n")
         
         # Get the current emotion (most recent emotion from the recent_emotions list)
-        current_emotion = None
-        if hasattr(agent_psyche, 'recent_emotions') and agent_psyche.recent_emotions:
-            current_emotion = agent_psyche.recent_emotions[0]
+        current_emotion = agent_psyche.recent_emotions[0] if agent_psyche.recent_emotions else None
         
         # Send agent update to visualizer
         send_to_visualizer({
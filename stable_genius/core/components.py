@@ -9,13 +9,14 @@ import json
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 
+from stable_genius.models.action import ActionResult
 from stable_genius.models.psyche import Psyche
 from stable_genius.utils.prompt import PromptFormatter
 from stable_genius.utils.llm import OllamaLLM
 from stable_genius.core.plan_processor import PlanProcessor
 from stable_genius.core.action_processor import ActionProcessor
 from stable_genius.utils.logger import logger
-from stable_genius.utils.response_processor import process_llm_response_for_json
+from stable_genius.utils.response_processor import EMOTION_SCHEMA, process_llm_response_for_json
 
 
 
@@ -69,7 +70,8 @@ class PlanComponent(PipelineComponent):
         psyche.increment_tactic_counter()
         
         # Generate appropriate prompt based on whether plan exists
-        plan_prompt = PromptFormatter.plan_prompt(psyche)
+        formatter = PromptFormatter.bind(psyche)
+        plan_prompt = formatter.plan_prompt()
         
         # Notify before LLM call
         context.update({
@@ -90,7 +92,9 @@ class PlanComponent(PipelineComponent):
         # Start time tracking
         start_time = time.time()
         
-        raw_plan_response = self.llm.generate(plan_prompt, agent_context)
+        raw_plan_response = self.llm.generate(
+            plan_prompt, agent_context, messages=formatter.plan_messages()
+        )
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
@@ -180,7 +184,8 @@ class ActionComponent(PipelineComponent):
         context["observation"] = observation
         
         # Generate action prompt
-        action_prompt = PromptFormatter.act_prompt(psyche, observation)
+        formatter = PromptFormatter.bind(psyche)
+        action_prompt = formatter.act_prompt(observation)
         
         # Notify before LLM call
         context.update({
@@ -200,7 +205,9 @@ class ActionComponent(PipelineComponent):
         # Start time tracking
         start_time = time.time()
         
-        raw_action_response = self.llm.generate(action_prompt, agent_context)
+        raw_action_response = self.llm.generate(
+            action_prompt, agent_context, messages=formatter.act_messages(observation)
+        )
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
@@ -387,25 +394,25 @@ Example: {{"tension_delta": "+8", "reasoning": "This comment feels dismissive an
             llm_tension_delta = max(5, llm_tension_delta)
             if is_stressful:
                 # If both LLM and classifier say stressful, amplify with moderate bonus
-                psyche.tension_level = min(100, original_tension + llm_tension_delta + 15)
+                psyche.update_tension_level(min(100, original_tension + llm_tension_delta + 15))
                 tension_reason = f"LLM delta (+{llm_tension_delta}) + stress bonus (+15)"
             else:
                 # Even non-stressful responses should increase tension (always positive)
-                psyche.tension_level = min(100, original_tension + llm_tension_delta)
+                psyche.update_tension_level(min(100, original_tension + llm_tension_delta))
                 tension_reason = f"LLM delta (+{llm_tension_delta})"
         elif is_stressful:
             # Stressful without LLM gets moderate increase
-            psyche.tension_level = min(psyche.tension_level + 15, 100)
+            psyche.update_tension_level(min(psyche.tension_level + 15, 100))
             tension_reason = "Stress classifier bonus (+15)"
         else:
             # Even "normal" conversations increase tension in reality TV (moderate positive range)
             random_delta = random.randint(2, 8)
-            psyche.tension_level = min(100, psyche.tension_level + random_delta)
+            psyche.update_tension_level(min(100, psyche.tension_level + random_delta))
             tension_reason = f"Baseline increase (+{random_delta}) - reality TV pressure builds"
         logger.info(f"Tension updated: {original_tension} -> {psyche.tension_level} ({tension_reason})")
         # Clear tension interpretation if tension changed
         if psyche.tension_level != original_tension:
-            psyche.tension_interpretation = None
+            psyche.update_tension_interpretation(None)
         context["tension_analysis"] = {
             "is_stressful": is_stressful,
             "tension_before": original_tension,
@@ -437,7 +444,7 @@ Example: {{"tension_delta": "+8", "reasoning": "This comment feels dismissive an
             emotion_intensity = 5
             emotion_system_summary = ""
             if raw_emotion_response and isinstance(raw_emotion_response, str):
-                emotion_data = process_llm_response_for_json(raw_emotion_response)
+                emotion_data = process_llm_response_for_json(raw_emotion_response, schema=EMOTION_SCHEMA)
                 emotion = emotion_data.get("emotion", "neutral")
                 emotion_reasoning = emotion_data.get("reasoning", "")
                 emotion_intensity = emotion_data.get("intensity", 5)
@@ -596,17 +603,17 @@ class ReflectComponent(PipelineComponent):
         input_message = context.get("input", "")
         if not input_message:
             input_message = context.get("observation", "")
-        action = context.get("action", {})
-        speech = action.get("speech", "")
+        action = ActionResult.from_dict(context.get("action", {}))
+        speech = action.speech
         
         # Add to memories
-        psyche.memories.append(f"{input_message} -> Me: {speech}")
+        psyche.add_memory(f"{input_message} -> Me: {speech}")
         
         # If action contains a conversation_summary, update the psyche's conversation_memory
         conversation_summary = None
-        if action.get("conversation_summary"):
-            psyche.update_conversation_memory(action.get("conversation_summary"))
-            conversation_summary = action.get("conversation_summary")
+        if action.conversation_summary:
+            psyche.update_conversation_memory(action.conversation_summary)
+            conversation_summary = action.conversation_summary
         
         # Generate tension interpretation using LLM
         tension_interpretation = await self._interpret_tension(psyche)
@@ -618,9 +625,10 @@ class ReflectComponent(PipelineComponent):
         new_stressors_added = await self._learn_stressful_phrases(input_message, psyche)
         
         # Generate reflection prompt
-        reflection_prompt = PromptFormatter.reflection_prompt(
-            psyche, input_message, action, tension_interpretation, conversation_summary
+        reflection_messages = PromptFormatter.bind(psyche).reflection_messages(
+            input_message, action, tension_interpretation, conversation_summary
         )
+        reflection_prompt = PromptFormatter.messages_to_text(reflection_messages)
         
         # Notify before LLM call
         context.update({
@@ -640,7 +648,7 @@ class ReflectComponent(PipelineComponent):
         # Start time tracking
         start_time = time.time()
         
-        raw_reflection_response = self.llm.generate(reflection_prompt, agent_context)
+        raw_reflection_response = self.llm.generate(reflection_prompt, agent_context, messages=reflection_messages)
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
@@ -752,24 +760,7 @@ class ReflectComponent(PipelineComponent):
 
     async def _interpret_tension(self, psyche: Psyche) -> str:
         """Use LLM to interpret tension level based on agent's interior state"""
-        # Get interior state
-        interior_summary = psyche.get_interior_summary()
-        interior_principles = psyche.get_interior_principles()
-        
-        # Build interior context
-        interior_context = ""
-        if interior_summary:
-            interior_context += f"Personal narrative: {interior_summary}\n"
-        if interior_principles:
-            interior_context += f"Guiding principles: {interior_principles}\n"
-        
-        tension_prompt = f"""You are {psyche.name} with a {psyche.personality} personality.
-{interior_context}
-Your current tension level is {psyche.tension_level}/100.
-
-Based on your personality, personal narrative, and guiding principles, how would you describe your current emotional/mental state in a few words? Be specific to your character and situation.
-
-Respond with just a brief phrase describing your current state (e.g., "anxiously focused", "calmly determined", "overwhelmed but pushing through", etc.)"""
+        tension_prompt = PromptFormatter.tension_interpretation_prompt(psyche)
 
         # Add agent-specific context
         agent_context = {
@@ -804,10 +795,11 @@ class IntentClassifierComponent(PipelineComponent):
         """Classify intent of the input and add to context"""
         last_message = context.get("input", "")
         
-        conversation_history = psyche.memories[-10:] if psyche.memories else []
+        conversation_history = psyche.recent_history_text
 
         # Generate intent classification prompt
-        prompt = PromptFormatter.intent_classification_prompt(last_message, conversation_history)
+        messages = PromptFormatter.intent_classification_messages(last_message, conversation_history)
+        prompt = PromptFormatter.messages_to_text(messages)
         
         # Notify before LLM call
         context.update({
@@ -827,7 +819,7 @@ class IntentClassifierComponent(PipelineComponent):
         # Start time tracking
         start_time = time.time()
         
-        raw_response = self.llm.generate(prompt, agent_context)
+        raw_response = self.llm.generate(prompt, agent_context, messages=messages)
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
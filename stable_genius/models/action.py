@@ -0,0 +1,16 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict
+
+
+@dataclass(slots=True)
+class ActionResult:
+    """Structured action produced by the action component"""
+    speech: str = ""
+    action: str = "say"
+    conversation_summary: str = ""
+    summary: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ActionResult":
+        """Build from an action dict (e.g. parsed LLM JSON), ignoring unknown keys"""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if data.get(f.name) is not None})
@@ -1,10 +1,20 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from typing import List, Dict, Optional, Any
+from functools import cached_property
+from itertools import count
 import json
 import os
+import re
 from pathlib import Path
 from stable_genius.utils.logger import logger
 
+# First sentence terminator in a tension interpretation
+_SENTENCE_END_RE = re.compile(r'[.!?]')
+
+# Process-wide source of psyche versions, so no two states (even of freshly
+# loaded psyches of the same agent) ever share a version number
+_VERSIONS = count(1)
+
 class Psyche(BaseModel):
     """Maintains agent's mental state and history"""
     memories: List[str] = []
@@ -32,6 +42,34 @@ class Psyche(BaseModel):
     hero_description: Optional[str] = None  # Description of their hero identity
     other_agent_perspectives: Dict[str, Dict[str, str]] = {}  # How they view other agents as villains
     
+    # Replaced on every state change so prompt caches can tell when they are stale
+    _version: int = PrivateAttr(default_factory=lambda: next(_VERSIONS))
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.touch()
+            if name in ("tension_level", "tension_interpretation"):
+                self.__dict__.pop("tension_display", None)
+            elif name == "relationships":
+                self.__dict__.pop("relationships_repr", None)
+            elif name == "memories":
+                self._drop_memory_caches()
+            elif name == "interior":
+                self._drop_interior_caches()
+            elif name == "plan":
+                self.__dict__.pop("plan_display", None)
+    
+    @property
+    def version(self) -> int:
+        """Process-unique number that changes whenever the psyche state changes"""
+        return self._version
+    
+    def touch(self):
+        """Mark the psyche as changed after an in-place mutation"""
+        self._version = next(_VERSIONS)
+        return self
+    
     @classmethod
     def load(cls, agent_name: str):
         """Load psyche from JSON file"""
@@ -140,6 +178,8 @@ class Psyche(BaseModel):
         if not hasattr(self, "interior") or not isinstance(self.interior, dict):
             self.interior = {"summary": "", "principles": ""}
         self.interior["summary"] = summary
+        self._drop_interior_caches()
+        self.touch()
         return self
     
     def update_interior_principles(self, principles: str):
@@ -147,20 +187,37 @@ class Psyche(BaseModel):
         if not hasattr(self, "interior") or not isinstance(self.interior, dict):
             self.interior = {"summary": "", "principles": ""}
         self.interior["principles"] = principles
+        self._drop_interior_caches()
+        self.touch()
         return self
     
     def get_interior_summary(self) -> str:
         """Get the current interior summary"""
+        return self.interior_summary
+    
+    def get_interior_principles(self) -> str:
+        """Get the current interior principles"""
+        return self.interior_principles
+    
+    @cached_property
+    def interior_summary(self) -> str:
+        """Interior summary, cached until the interior is updated"""
         if hasattr(self, "interior") and isinstance(self.interior, dict):
             return self.interior.get("summary", "")
         return ""
     
-    def get_interior_principles(self) -> str:
-        """Get the current interior principles"""
+    @cached_property
+    def interior_principles(self) -> str:
+        """Interior principles, cached until the interior is updated"""
         if hasattr(self, "interior") and isinstance(self.interior, dict):
             return self.interior.get("principles", "")
         return ""
     
+    def _drop_interior_caches(self):
+        """Forget the cached interior summary and principles"""
+        self.__dict__.pop("interior_summary", None)
+        self.__dict__.pop("interior_principles", None)
+    
     def update_interior(self, summary: str = None, principles: str = None):
         """Update interior state with summary and/or principles"""
         if not hasattr(self, "interior") or not isinstance(self.interior, dict):
@@ -171,16 +228,15 @@ class Psyche(BaseModel):
         if principles is not None:
             self.interior["principles"] = principles
         
+        self._drop_interior_caches()
+        self.touch()
         return self
     
     def update_emotion(self, emotion: str):
         """Update recent emotions, ensuring we don't repeat the same 3 too often"""
-        # Ensure recent_emotions exists
-        if not hasattr(self, "recent_emotions"):
-            self.recent_emotions = []
-        
         # Add new emotion to the front
         self.recent_emotions.insert(0, emotion)
+        self.touch()
         
         # Keep only the last 5 emotions for tracking
         if len(self.recent_emotions) > 5:
@@ -207,6 +263,41 @@ class Psyche(BaseModel):
         else:
             return all_emotions
     
+    def add_relationship(self, entity: str, metadata: Optional[Dict] = None):
+        """Add a relationship if not already present"""
+        if entity not in self.relationships:
+            self.relationships[entity] = metadata if metadata is not None else {"familiarity": 0}
+            self.__dict__.pop("relationships_repr", None)
+            self.touch()
+        return self
+    
+    @cached_property
+    def relationships_repr(self) -> str:
+        """List of relationship names as shown in prompts, cached until the set changes"""
+        return repr(list(self.relationships))
+    
+    def add_memory(self, memory: str):
+        """Append a new memory"""
+        self.memories.append(memory)
+        self._drop_memory_caches()
+        self.touch()
+        return self
+    
+    def _drop_memory_caches(self):
+        """Forget the cached renderings of recent memories"""
+        self.__dict__.pop("recent_memories_repr", None)
+        self.__dict__.pop("recent_history_text", None)
+    
+    @cached_property
+    def recent_memories_repr(self) -> str:
+        """Last 10 memories as shown in prompts (empty when there are none), cached until memories change"""
+        return repr(self.memories[-10:]) if self.memories else ""
+    
+    @cached_property
+    def recent_history_text(self) -> str:
+        """Last 10 memories joined one per line, cached until memories change"""
+        return "\n".join(self.memories[-10:])
+    
     def clear_memories(self):
         """Clear all memories from this psyche"""
         self.memories = []
@@ -222,7 +313,26 @@ class Psyche(BaseModel):
         psyche.save()
         return psyche
     
-    def update_tension_interpretation(self, interpretation: str):
+    def update_tension_level(self, tension_level: int):
+        """Update the tension level"""
+        self.tension_level = tension_level
+        return self
+    
+    def update_tension_interpretation(self, interpretation: Optional[str]):
         """Update the tension interpretation"""
         self.tension_interpretation = interpretation
-        return self 
\ No newline at end of file
+        return self
+    
+    @cached_property
+    def plan_display(self) -> str:
+        """Plan tactics as a compact arrow-separated string (empty without a plan), cached until the plan changes"""
+        return " → ".join(map(str, self.plan)) if self.plan else ""
+    
+    @cached_property
+    def tension_display(self) -> str:
+        """Brief tension description for prompts, cached until the tension fields are reassigned"""
+        if not self.tension_interpretation:
+            return f"{self.tension_level}/100 tension"
+        # Take first few words and remove sentence endings
+        tension_brief = _SENTENCE_END_RE.split(self.tension_interpretation, maxsplit=1)[0]
+        return ' '.join(tension_brief.split()[:4]).lower()  # Limit to 4 words max
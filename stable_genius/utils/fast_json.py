@@ -0,0 +1,15 @@
+"""
+JSON helpers backed by orjson when it is installed, the stdlib json module otherwise
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib module is the fallback
+    orjson = None
+
+
+if orjson is not None:
+    loads = orjson.loads
+else:
+    loads = json.loads
@@ -77,14 +77,33 @@ class OllamaLLM:
             logger.info(f"Error: Could not connect to Ollama server: {str(e)}")
             return False
     
-    def generate(self, prompt: str, context: dict = None) -> str:
-        """Generate text using either Anthropic API or Ollama API based on model type"""
+    def generate(self, prompt: str, context: dict = None, messages: list = None) -> str:
+        """Generate text using either Anthropic API or Ollama API based on model type
+        
+        Args:
+            prompt: The prompt to send (also what gets recorded for the interaction)
+            context: Extra information recorded with the interaction
+            messages: Structured form of the prompt (system block + user turn), sent
+                instead of the flat prompt so the static instructions can be prefix-cached
+        """
         if self.is_anthropic_model:
-            return self._generate_anthropic(prompt, context)
+            return self._generate_anthropic(prompt, context, messages)
         else:
-            return self._generate_ollama(prompt, context)
+            return self._generate_ollama(prompt, context, messages)
+    
+    @staticmethod
+    def _split_messages(messages: list):
+        """Separate system content blocks from the conversation turns"""
+        system_blocks = []
+        turns = []
+        for message in messages:
+            if message["role"] == "system":
+                system_blocks.extend(message["content"])
+            else:
+                turns.append(message)
+        return system_blocks, turns
     
-    def _generate_anthropic(self, prompt: str, context: dict = None) -> str:
+    def _generate_anthropic(self, prompt: str, context: dict = None, messages: list = None) -> str:
         """Generate text using Anthropic API"""
         # Log the request with a truncated prompt (for privacy/readability)
         truncated_prompt = prompt[:100] + "..." if len(prompt) > 100 else prompt
@@ -95,13 +114,22 @@ class OllamaLLM:
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         
         try:
-            response = self.anthropic_client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            if messages:
+                system_blocks, turns = self._split_messages(messages)
+                response = self.anthropic_client.messages.create(
+                    model=self.model,
+                    max_tokens=4000,
+                    system=system_blocks,
+                    messages=turns
+                )
+            else:
+                response = self.anthropic_client.messages.create(
+                    model=self.model,
+                    max_tokens=4000,
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
             
             elapsed_time = time.time() - start_time
             response_text = response.content[0].text
@@ -127,8 +155,21 @@ class OllamaLLM:
             self._record_interaction(prompt, error_response, timestamp, elapsed_time, context)
             return error_response
     
-    def _generate_ollama(self, prompt: str, context: dict = None) -> str:
+    def _generate_ollama(self, prompt: str, context: dict = None, messages: list = None) -> str:
         """Generate text using Ollama API with retry mechanism for timeouts and 404 errors"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "anthropic_key": self.anthropic_key
+        }
+        if messages:
+            # Ollama takes the system prompt separately, keeping it a stable prefix
+            system_blocks, turns = self._split_messages(messages)
+            # Same separators as messages_to_text, so Ollama sees the flattened prompt's text
+            payload["system"] = "\n\n".join(block["text"].rstrip() for block in system_blocks)
+            payload["prompt"] = "".join(turn["content"] for turn in turns).rstrip()
+        
         retries = 0
         backoff = self.retry_delay
         
@@ -144,12 +185,7 @@ class OllamaLLM:
             try:
                 response = requests.post(
                     f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "anthropic_key": self.anthropic_key
-                    },
+                    json=payload,
                     timeout=30  # Add a timeout to prevent hanging
                 )
                 
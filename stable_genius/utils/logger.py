@@ -51,20 +51,23 @@ class Logger:
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
     
-    def debug(self, message):
-        self.logger.debug(message)
+    def isEnabledFor(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, message, *args):
+        self.logger.debug(message, *args)
         
-    def info(self, message):
-        self.logger.info(message)
+    def info(self, message, *args):
+        self.logger.info(message, *args)
         
-    def warning(self, message):
-        self.logger.warning(message)
+    def warning(self, message, *args):
+        self.logger.warning(message, *args)
         
-    def error(self, message):
-        self.logger.error(message)
+    def error(self, message, *args):
+        self.logger.error(message, *args)
         
-    def critical(self, message):
-        self.logger.critical(message)
+    def critical(self, message, *args):
+        self.logger.critical(message, *args)
 
 
 def get_logger(name=None, level=None, log_to_file=False, log_dir=None):
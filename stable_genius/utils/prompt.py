@@ -1,295 +1,147 @@
+import io
+import logging
+import os
+import queue
+import sys
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from stable_genius.models.action import ActionResult
 from stable_genius.models.psyche import Psyche
 from stable_genius.utils.logger import logger
 
 # Please no indents in prompts
 
-class PromptFormatter:
-    @staticmethod
-    def _format_psyche_context(psyche: Psyche) -> str:
-        """Helper method to format consistent psyche context"""
-        logger.debug(f"🧠 Formatting psyche context for {psyche.name}")
-        
-        # Build interior context
-        interior_summary = psyche.get_interior_summary()
-        interior_principles = psyche.get_interior_principles()
-        interior_context = ""
-        if interior_summary:
-            interior_context += f"Personal narrative: {interior_summary}\n"
-            logger.debug(f"  📝 Interior summary included: {interior_summary[:50]}...")
-        if interior_principles:
-            interior_context += f"Guiding principles: {interior_principles}\n"
-            logger.debug(f"  🎯 Interior principles included: {interior_principles}")
-        
-        # Add premise interpretation if available
-        premise_context = ""
-        if psyche.premise_interpretation:
-            premise_context = f"Current situation perspective: {psyche.premise_interpretation}\n"
-            logger.info(f"  🎬 PREMISE CONTEXT INCLUDED for {psyche.name}: {psyche.premise_interpretation[:80]}...")
-        else:
-            logger.warning(f"  ⚠️  NO PREMISE INTERPRETATION for {psyche.name} - agent may lack reality TV context!")
-        
-        # Add hero identity (how they see themselves) 
-        hero_context = ""
-        if psyche.hero_description:
-            hero_context = f"Core identity: You believe you are {psyche.hero_description}\n"
-            logger.info(f"  🦸 HERO IDENTITY INCLUDED for {psyche.name}: {psyche.hero_description}")
-        else:
-            logger.warning(f"  ⚠️  NO HERO IDENTITY for {psyche.name} - missing self-perception!")
-        
-        # Add villain perspectives (how they see others)
-        villain_context = ""
-        if psyche.other_agent_perspectives:
-            perspectives = []
-            for agent_name, perspective_data in psyche.other_agent_perspectives.items():
-                perspective = perspective_data.get("perspective", "")
-                if perspective:
-                    perspectives.append(f"About {agent_name}: {perspective}")
-            if perspectives:
-                villain_context = f"Other people: {' | '.join(perspectives)}\n"
-                logger.info(f"  👁️  VILLAIN PERSPECTIVES INCLUDED for {psyche.name}: {len(perspectives)} perspectives")
-                for i, persp in enumerate(perspectives):
-                    logger.debug(f"    {i+1}. {persp[:60]}...")
-        else:
-            logger.warning(f"  ⚠️  NO VILLAIN PERSPECTIVES for {psyche.name} - missing social dynamics!")
-        
-        # Subtly incorporate hidden flaws without making them explicit
-        # The agent should not be consciously aware of these flaws
-        subconscious_tendencies = ""
-        if psyche.hidden_flaws:
-            logger.info(f"  🎭 HIDDEN FLAWS PROCESSING for {psyche.name}: {psyche.hidden_flaws}")
-            # Convert flaws to subtle behavioral tendencies without naming the flaw
-            tendency_hints = []
-            for flaw in psyche.hidden_flaws:
-                if flaw == "Arrogant":
-                    tendency_hints.append("confidence in your own judgment")
-                elif flaw == "Backstabbing":
-                    tendency_hints.append("awareness of strategic opportunities")
-                elif flaw == "Blatant Liar":
-                    tendency_hints.append("flexibility with facts when helpful")
-                elif flaw == "Bossy":
-                    tendency_hints.append("natural leadership instincts")
-                elif flaw == "Chronic Backstager":
-                    tendency_hints.append("strategic thinking about relationships")
-                elif flaw == "Conflict Ball":
-                    tendency_hints.append("passion for standing your ground")
-                elif flaw == "Cowardly":
-                    tendency_hints.append("careful consideration of risks")
-                elif flaw == "Crybaby":
-                    tendency_hints.append("emotional sensitivity")
-                elif flaw == "Drama Queen":
-                    tendency_hints.append("appreciation for the significance of events")
-                elif flaw == "Flaky":
-                    tendency_hints.append("adaptability to changing circumstances")
-                elif flaw == "Greedy":
-                    tendency_hints.append("focus on personal advancement")
-                elif flaw == "Hot-Blooded":
-                    tendency_hints.append("quick emotional reactions")
-                elif flaw == "Lazy":
-                    tendency_hints.append("efficiency-focused approach")
-                elif flaw == "Manipulative":
-                    tendency_hints.append("understanding of social dynamics")
-                elif flaw == "Narcissist":
-                    tendency_hints.append("strong sense of personal importance")
-                elif flaw == "Needy":
-                    tendency_hints.append("value for others' opinions")
-                elif flaw == "Poor Communication Kills":
-                    tendency_hints.append("unique interpretation of conversations")
-                elif flaw == "Sore Loser":
-                    tendency_hints.append("high investment in outcomes")
-                elif flaw == "Stubborn":
-                    tendency_hints.append("commitment to your convictions")
-                elif flaw == "Vain":
-                    tendency_hints.append("awareness of how others perceive you")
-            
-            if tendency_hints:
-                subconscious_tendencies = f"Natural tendencies: {', '.join(tendency_hints[:2])}\n"  # Limit to 2 to avoid overload
-                logger.info(f"  🧩 SUBCONSCIOUS TENDENCIES INCLUDED for {psyche.name}: {', '.join(tendency_hints[:2])}")
-        else:
-            logger.warning(f"  ⚠️  NO HIDDEN FLAWS for {psyche.name} - missing behavioral complexity!")
-        
-        # Use tension interpretation if available, make it brief and not a complete sentence
-        if psyche.tension_interpretation:
-            # Take first few words and remove sentence endings
-            tension_brief = psyche.tension_interpretation.split('.')[0].split('!')[0].split('?')[0]
-            tension_brief = ' '.join(tension_brief.split()[:4])  # Limit to 4 words max
-            tension_display = tension_brief.lower()
-        else:
-            tension_display = f"{psyche.tension_level}/100 tension"
-        
-        # Add tactic counter information
-        tactic_info = f"Active tactic: {psyche.active_tactic or 'None'} (used for {psyche.rounds_since_tactic_change} rounds)"
-        
-        # Log final summary of what premise elements were included
-        included_elements = []
-        if premise_context:
-            included_elements.append("premise_interpretation")
-        if hero_context:
-            included_elements.append("hero_identity")
-        if villain_context:
-            included_elements.append("villain_perspectives")
-        if subconscious_tendencies:
-            included_elements.append("hidden_flaws")
-        
-        if included_elements:
-            logger.info(f"  ✅ FINAL CONTEXT for {psyche.name}: {', '.join(included_elements)} included in prompt")
-        else:
-            logger.error(f"  ❌ NO PREMISE ELEMENTS included for {psyche.name} - using generic agent context!")
-        
-        return f"""You are {psyche.name} with a {psyche.personality} personality.
-{interior_context}{premise_context}{hero_context}{villain_context}{subconscious_tendencies}Current state: {tension_display}
-Recent history: {psyche.memories[-10:] if psyche.memories else 'No memories yet'}
-Relationships: {list(psyche.relationships.keys())}
-Conversation memory: {psyche.conversation_memory or 'No conversation summary yet'}
-Current goal: {psyche.goal or 'No goal set'}
-Current plan: {psyche.plan or 'No plan set'}
-{tactic_info}"""
-
-    @staticmethod
-    def plan_prompt(psyche: Psyche) -> str:
-        """Format psyche into planning prompt"""
-        if psyche.plan:
-            # If a plan exists, direct to tactic_selection_prompt instead
-            return PromptFormatter.tactic_selection_prompt(psyche)
-        
-        # Get interior context
-        interior_summary = psyche.get_interior_summary()
-        interior_principles = psyche.get_interior_principles()
-        
-        # Build interiority-focused planning prompt
-        interior_guidance = ""
-        if interior_summary:
-            interior_guidance += f"Based on your personal narrative: {interior_summary}\n"
-        if interior_principles:
-            interior_guidance += f"Guided by your principles: {interior_principles}\n"
-
-        # Add hero/villain dynamic context
-        dynamic_context = ""
-        if psyche.hero_description:
-            dynamic_context += f"\nYour core identity: {psyche.hero_description}\n"
-        if psyche.other_agent_perspectives:
-            villain_views = []
-            for name, data in psyche.other_agent_perspectives.items():
-                villain_trope = data.get('villain_trope', 'antagonist')
-                villain_views.append(f"{name} ({villain_trope})")
-            if villain_views:
-                dynamic_context += f"How you view others: {', '.join(villain_views)} - this colors your expectations and goals\n"
-
-        if not interior_summary and not interior_principles:
-            # Fallback to personality-based planning when no interiority exists
-            interior_guidance = f"Drawing from your {psyche.personality} personality traits, "
-
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
-
-{interior_guidance}{dynamic_context}
-What should be your goal and plan in this conversation? Your goal and tactics should be deeply rooted in who you are as a person - your personal story, your values, and your guiding principles. Given how you view yourself (hero) and how you view others (potentially problematic), what do you need to accomplish here? Let your hidden tendencies naturally influence your tactical choices without explicitly acknowledging them.
+# Fallback text for empty psyche fields, interned so every prompt shares one object
+_NO_MEMORIES, _NO_CONVERSATION_SUMMARY, _NO_GOAL, _NO_PLAN, _NONE = map(sys.intern, (
+    "No memories yet",
+    "No conversation summary yet",
+    "No goal set",
+    "No plan set",
+    "None",
+))
+
+# Reusable buffers shared by every formatter that assembles a prompt piece by piece
+_BUFFER_POOL: "queue.LifoQueue[io.StringIO]" = queue.LifoQueue(maxsize=8)
+
+
+# Rendered psyche contexts keyed by (psyche.name, psyche.version); versions are
+# process-unique, so a key never matches another psyche's state
+CONTEXT_CACHE_SIZE = 64
+_CONTEXT_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+
+# One bound formatter per agent name (see bind)
+_BOUND_FORMATTERS: Dict[str, "BoundFormatter"] = {}
+
+
+@contextmanager
+def _checkout_buffer():
+    """Borrow an empty StringIO from the pool, returning it when done"""
+    try:
+        buf = _BUFFER_POOL.get_nowait()
+        buf.seek(0)
+        buf.truncate(0)
+    except queue.Empty:
+        buf = io.StringIO()
+    try:
+        yield buf
+    finally:
+        try:
+            _BUFFER_POOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+def _escape_braces(text: str) -> str:
+    """Escape literal braces so fixed text can be embedded in a format_map template"""
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+# Full worked example responses cost many prompt tokens on every call, so by
+# default the instructions end with a compact schema hint instead; set
+# VERBOSE_PROMPT_EXAMPLES=1 to bring the examples back when debugging output
+VERBOSE_PROMPT_EXAMPLES = os.getenv("VERBOSE_PROMPT_EXAMPLES", "").lower() in ("1", "true", "yes")
+
+# Prompts are split into a per-turn head (filled in with str.format_map) and
+# static instructions that can be sent as a cacheable system block. The static
+# instructions always come first so the prompt prefix stays stable between calls
+_PLAN_RULES = """What should be your goal and plan in this conversation? Your goal and tactics should be deeply rooted in who you are as a person - your personal story, your values, and your guiding principles. Given how you view yourself (hero) and how you view others (potentially problematic), what do you need to accomplish here? Let your hidden tendencies naturally influence your tactical choices without explicitly acknowledging them.
 
 IMPORTANT: Respond ONLY with valid JSON containing these keys:
 - 'goal': Your conversational goal (4 words maximum)
 - 'plan': An ordered array of tactics that align with your inner self and principles (4 brief tactics maximum, each 1-3 words)
 - 'summary': A brief inner monologue reflecting on how your personal narrative influences this plan, neurotic sounding. make it present tense. Do NOT include any actions such as *anxiously adjusts glasses*
-- 'system_summary': Technical analysis formatted as: "PLAN_COMPONENT :: GENERATED\\n{{\\n    \\"goal_established\\": \\"[your goal]\\",\\n    \\"tactics_count\\": [number of tactics],\\n    \\"active_tactic\\": \\"[first tactic]\\",\\n    \\"planning_basis\\": \\"interiority_analysis\\",\\n    \\"strategic_coherence\\": \\"optimized\\"\\n}}"
+- 'system_summary': Technical analysis formatted as: "PLAN_COMPONENT :: GENERATED\\n{\\n    \\"goal_established\\": \\"[your goal]\\",\\n    \\"tactics_count\\": [number of tactics],\\n    \\"active_tactic\\": \\"[first tactic]\\",\\n    \\"planning_basis\\": \\"interiority_analysis\\",\\n    \\"strategic_coherence\\": \\"optimized\\"\\n}\""""
 
-Example response: {{"goal": "build genuine connection", "plan": ["listen deeply", "share vulnerably", "find common ground", "be authentic"], "summary": "My past experiences with rejection make me want to find real connection here. I can't just go through the motions - I need to find something authentic we both care about. That's the only way this feels meaningful to me.", "system_summary": "PLAN_COMPONENT :: GENERATED\\n{{\\n    \\"goal_established\\": \\"build genuine connection\\",\\n    \\"tactics_count\\": 4,\\n    \\"active_tactic\\": \\"listen deeply\\",\\n    \\"planning_basis\\": \\"interiority_analysis\\",\\n    \\"strategic_coherence\\": \\"optimized\\"\\n}}"}}"""
+_PLAN_EXAMPLE = """Example response: {"goal": "build genuine connection", "plan": ["listen deeply", "share vulnerably", "find common ground", "be authentic"], "summary": "My past experiences with rejection make me want to find real connection here. I can't just go through the motions - I need to find something authentic we both care about. That's the only way this feels meaningful to me.", "system_summary": "PLAN_COMPONENT :: GENERATED\\n{\\n    \\"goal_established\\": \\"build genuine connection\\",\\n    \\"tactics_count\\": 4,\\n    \\"active_tactic\\": \\"listen deeply\\",\\n    \\"planning_basis\\": \\"interiority_analysis\\",\\n    \\"strategic_coherence\\": \\"optimized\\"\\n}"}"""
 
-    @staticmethod
-    def tactic_selection_prompt(psyche: Psyche) -> str:
-        """Format psyche into tactic selection prompt"""
-        # Get interior context for guidance
-        interior_summary = psyche.get_interior_summary()
-        interior_principles = psyche.get_interior_principles()
-        
-        # Build interiority-focused guidance
-        interior_guidance = ""
-        if interior_summary:
-            interior_guidance += f"Reflecting on your personal narrative: {interior_summary}\n"
-        if interior_principles:
-            interior_guidance += f"Staying true to your principles: {interior_principles}\n"
-        
-        if not interior_summary and not interior_principles:
-            # Fallback to personality-based guidance
-            interior_guidance = f"Drawing from your {psyche.personality} personality, "
-        
-        # Determine if tactic switching is encouraged based on counter
-        rounds_info = f"You've been using '{psyche.active_tactic}' for {psyche.rounds_since_tactic_change} rounds."
-        switching_guidance = ""
-        if psyche.rounds_since_tactic_change >= 4:
-            switching_guidance = "Consider switching tactics - you've been using the same approach for a while and variety often leads to better outcomes."
-        elif psyche.rounds_since_tactic_change >= 2:
-            switching_guidance = "You might want to consider switching tactics soon to keep the conversation dynamic."
-        else:
-            switching_guidance = "Your current tactic is still fresh - consider whether it's working well or if a change would be beneficial."
-            
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
+_PLAN_SCHEMA = """Schema: {"goal": "<str>", "plan": ["<str>", ...], "summary": "<str>", "system_summary": "<str>"}"""
+
+_PLAN_INSTRUCTIONS = f"{_PLAN_RULES}\n\n{_PLAN_EXAMPLE if VERBOSE_PROMPT_EXAMPLES else _PLAN_SCHEMA}"
+
+_TACTIC_SELECTION_HEAD = """{turn_state}
 
 {interior_guidance}
-{rounds_info}
+You've been using '{active_tactic}' for {rounds_since_tactic_change} rounds.
 {switching_guidance}
 
 Given the current state of the conversation, should you:
-1. Keep using the current tactic "{psyche.active_tactic}" because it aligns with your inner values and the situation calls for it
+1. Keep using the current tactic "{active_tactic}" because it aligns with your inner values and the situation calls for it
 2. Switch to a different tactic from your plan that better reflects who you are and what you truly believe in this moment
 
-Consider what your personal story and core values tell you about how to proceed authentically. Also consider that tactical variety often leads to more engaging and effective conversations.
+"""
+
+_TACTIC_SWITCH_URGED = "Consider switching tactics - you've been using the same approach for a while and variety often leads to better outcomes."
+_TACTIC_SWITCH_SOON = "You might want to consider switching tactics soon to keep the conversation dynamic."
+_TACTIC_SWITCH_FRESH = "Your current tactic is still fresh - consider whether it's working well or if a change would be beneficial."
+
+_TACTIC_SELECTION_RULES = """Consider what your personal story and core values tell you about how to proceed authentically. Also consider that tactical variety often leads to more engaging and effective conversations.
 
 IMPORTANT: Respond ONLY with valid JSON containing these keys:
 - 'active_tactic': The tactic you choose to use
 - 'summary': A brief inner monologue reflecting on how your personal narrative guides this tactic choice, neurotic sounding. make it present tense. Do NOT include any actions such as *anxiously adjusts glasses*
-- 'system_summary': Technical analysis formatted as: "PLAN_COMPONENT :: TACTIC_UPDATED\\n{{\\n    \\"selected_tactic\\": \\"[your chosen tactic]\\",\\n    \\"selection_method\\": \\"llm_guided\\",\\n    \\"plan_coherence\\": \\"maintained\\",\\n    \\"cognitive_state\\": \\"adaptive\\"\\n}}"
+- 'system_summary': Technical analysis formatted as: "PLAN_COMPONENT :: TACTIC_UPDATED\\n{\\n    \\"selected_tactic\\": \\"[your chosen tactic]\\",\\n    \\"selection_method\\": \\"llm_guided\\",\\n    \\"plan_coherence\\": \\"maintained\\",\\n    \\"cognitive_state\\": \\"adaptive\\"\\n}\""""
 
-Example response: {{"active_tactic": "show vulnerability", "summary": "My instinct is to put up walls when I feel judged, but that's exactly what got me into trouble before. If I'm really committed to being authentic, I need to let them see the real me, even if it's scary. That's what genuine connection requires.", "system_summary": "PLAN_COMPONENT :: TACTIC_UPDATED\\n{{\\n    \\"selected_tactic\\": \\"show vulnerability\\",\\n    \\"selection_method\\": \\"llm_guided\\",\\n    \\"plan_coherence\\": \\"maintained\\",\\n    \\"cognitive_state\\": \\"adaptive\\"\\n}}"}}"""
-    
-    @staticmethod
-    def act_prompt(psyche: Psyche, observation: str) -> str:
-        """Format psyche into action prompt"""
-        # Add tension-aware guidance
-        tension_guidance = ""
-        if psyche.tension_level < 30:
-            tension_guidance = "\n\nYou're feeling relatively calm and composed right now. Keep your response measured, friendly, and open. Don't escalate unnecessarily."
-        elif psyche.tension_level < 60:
-            tension_guidance = "\n\nYou're starting to feel some stress building up. Your response should show subtle signs of tension - perhaps more direct, slightly defensive, or with an edge to your tone."
-        else:
-            tension_guidance = "\n\nYou're highly stressed and agitated right now. Your response should be more dramatic, emotional, and confrontational. Don't hold back - let the tension show in your words."
-
-        # Add hero/villain dynamic reminder
-        identity_guidance = ""
-        if psyche.hero_description:
-            identity_guidance = f"\n\nRemember who you are: {psyche.hero_description}. Your response should reflect this core identity."
-
-        # Add premise stakes reminder
-        stakes_guidance = ""
-        if psyche.premise_interpretation:
-            # Extract just the key stakes/motivation from premise interpretation
-            stakes_guidance = f"\n\nThe stakes are high - this situation matters deeply to you. Let your underlying motivations and the gravity of the situation show naturally in your response."
-
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
+_TACTIC_SELECTION_EXAMPLE = """Example response: {"active_tactic": "show vulnerability", "summary": "My instinct is to put up walls when I feel judged, but that's exactly what got me into trouble before. If I'm really committed to being authentic, I need to let them see the real me, even if it's scary. That's what genuine connection requires.", "system_summary": "PLAN_COMPONENT :: TACTIC_UPDATED\\n{\\n    \\"selected_tactic\\": \\"show vulnerability\\",\\n    \\"selection_method\\": \\"llm_guided\\",\\n    \\"plan_coherence\\": \\"maintained\\",\\n    \\"cognitive_state\\": \\"adaptive\\"\\n}"}"""
+
+_TACTIC_SELECTION_SCHEMA = """Schema: {"active_tactic": "<str>", "summary": "<str>", "system_summary": "<str>"}"""
+
+_TACTIC_SELECTION_INSTRUCTIONS = f"{_TACTIC_SELECTION_RULES}\n\n{_TACTIC_SELECTION_EXAMPLE if VERBOSE_PROMPT_EXAMPLES else _TACTIC_SELECTION_SCHEMA}"
+
+_ACT_HEAD = """{turn_state}
 
 {observation}
 {tension_guidance}{identity_guidance}{stakes_guidance}
 
-How should you respond? Use your active tactic to guide your response. Let your hidden tendencies show naturally in how you speak, without being explicitly aware of them.
+"""
+
+_ACT_CALM_GUIDANCE = "\n\nYou're feeling relatively calm and composed right now. Keep your response measured, friendly, and open. Don't escalate unnecessarily."
+_ACT_STRESSED_GUIDANCE = "\n\nYou're starting to feel some stress building up. Your response should show subtle signs of tension - perhaps more direct, slightly defensive, or with an edge to your tone."
+_ACT_AGITATED_GUIDANCE = "\n\nYou're highly stressed and agitated right now. Your response should be more dramatic, emotional, and confrontational. Don't hold back - let the tension show in your words."
+_ACT_STAKES_GUIDANCE = "\n\nThe stakes are high - this situation matters deeply to you. Let your underlying motivations and the gravity of the situation show naturally in your response."
+
+_ACT_RULES = """How should you respond? Use your active tactic to guide your response. Let your hidden tendencies show naturally in how you speak, without being explicitly aware of them.
 
 IMPORTANT: Keep your speech to 30 words or under and no more than two sentences. Respond ONLY with valid JSON containing these keys:
 - 'action': Type of action (usually "say")
 - 'speech': Your actual dialogue/utterance (30 words maximum, 2 sentences maximum)
 - 'conversation_summary': Brief 1-2 sentence update of how you perceive the conversation is going
 - 'summary': The agent's utterance without quotes
-- 'system_summary': Technical analysis formatted as: "SPEECH_GENERATION :: PROCESSED\\n{{\\n    \\"dialogue\\": \\"[your speech]\\",\\n    \\"action_type\\": \\"[action]\\",\\n    \\"tactic_applied\\": \\"[active tactic]\\",\\n    \\"style_filter\\": \\"reality_tv_persona\\",\\n    \\"output_coherence\\": \\"optimized\\"\\n}}"
+- 'system_summary': Technical analysis formatted as: "SPEECH_GENERATION :: PROCESSED\\n{\\n    \\"dialogue\\": \\"[your speech]\\",\\n    \\"action_type\\": \\"[action]\\",\\n    \\"tactic_applied\\": \\"[active tactic]\\",\\n    \\"style_filter\\": \\"reality_tv_persona\\",\\n    \\"output_coherence\\": \\"optimized\\"\\n}\""""
 
-Example response: {{"action": "say", "speech": "Hello, how are you doing today?", "conversation_summary": "The conversation just started with a greeting. I need to build rapport.", "summary": "Hello, how are you doing today?", "system_summary": "SPEECH_GENERATION :: PROCESSED\\n{{\\n    \\"dialogue\\": \\"Hello, how are you doing today?\\",\\n    \\"action_type\\": \\"say\\",\\n    \\"tactic_applied\\": \\"friendly_greeting\\",\\n    \\"style_filter\\": \\"reality_tv_persona\\",\\n    \\"output_coherence\\": \\"optimized\\"\\n}}"}}"""
+_ACT_EXAMPLE = """Example response: {"action": "say", "speech": "Hello, how are you doing today?", "conversation_summary": "The conversation just started with a greeting. I need to build rapport.", "summary": "Hello, how are you doing today?", "system_summary": "SPEECH_GENERATION :: PROCESSED\\n{\\n    \\"dialogue\\": \\"Hello, how are you doing today?\\",\\n    \\"action_type\\": \\"say\\",\\n    \\"tactic_applied\\": \\"friendly_greeting\\",\\n    \\"style_filter\\": \\"reality_tv_persona\\",\\n    \\"output_coherence\\": \\"optimized\\"\\n}"}"""
 
-    @staticmethod
-    def intent_classification_prompt(last_message: str, conversation_history: list = None) -> str:
-        """Format prompt for intent classification using last message and conversation history
+_ACT_SCHEMA = """Schema: {"action": "<str>", "speech": "<str>", "conversation_summary": "<str>", "summary": "<str>", "system_summary": "<str>"}"""
 
-        Args:
-            last_message: The last message to classify
-            conversation_history: List of recent utterances for context
-        """
-        conversation_context = ""
-        if conversation_history and len(conversation_history) > 0:
-            conversation_context = "Previous conversation:\n" + "\n".join(conversation_history[-10:]) + "\n\n"
-        
-        return f"""Classify the intent of the following message into one of these categories:
+_ACT_INSTRUCTIONS = f"{_ACT_RULES}\n\n{_ACT_EXAMPLE if VERBOSE_PROMPT_EXAMPLES else _ACT_SCHEMA}"
+
+_INTENT_HEAD = """{conversation_context}Last message to classify: "{last_message}"
+
+Your response:"""
+
+_INTENT_RULES = """Classify the intent of the last message below into one of these categories:
 
 - greeting: Starting a conversation, saying hello
 - question: Asking for information or clarification  
@@ -304,8 +156,6 @@ Example response: {{"action": "say", "speech": "Hello, how are you doing today?"
 - goodbye: Ending conversation, saying farewell
 - other: Anything that doesn't fit the above categories
 
-{conversation_context}Last message to classify: "{last_message}"
-
 IMPORTANT: Respond ONLY with valid JSON containing all these keys:
 - 'intent': The classified intent category
 - 'confidence': Confidence score (0-100)
@@ -313,61 +163,18 @@ IMPORTANT: Respond ONLY with valid JSON containing all these keys:
 - 'emotional_tone': Detected emotional tone (positive, negative, neutral, excited, frustrated, etc.)
 - 'urgency': How urgent this message seems (low, medium, high)
 - 'category': Broader grouping (social, informational, emotional, transactional)
-- 'system_summary': Technical analysis formatted as: "INTENT_PARSER :: ANALYZED\\n{{\\n    \\"classification\\": \\"[intent]\\",\\n    \\"confidence_score\\": \\"[confidence]%\\",\\n    \\"emotional_vector\\": \\"[emotional_tone]\\",\\n    \\"urgency_level\\": \\"[urgency]\\",\\n    \\"processing_context\\": \\"[category]_domain\\"\\n}}"
-
-Examples:
-{{"intent": "greeting", "confidence": 95, "summary": "They're clearly starting the conversation with a friendly hello.", "emotional_tone": "positive", "urgency": "low", "category": "social", "system_summary": "INTENT_PARSER :: ANALYZED\\n{{\\n    \\"classification\\": \\"greeting\\",\\n    \\"confidence_score\\": \\"95%\\",\\n    \\"emotional_vector\\": \\"positive\\",\\n    \\"urgency_level\\": \\"low\\",\\n    \\"processing_context\\": \\"social_domain\\"\\n}}"}}
-{{"intent": "question", "confidence": 80, "summary": "This sounds like they want to know something specific.", "emotional_tone": "neutral", "urgency": "medium", "category": "informational", "system_summary": "INTENT_PARSER :: ANALYZED\\n{{\\n    \\"classification\\": \\"question\\",\\n    \\"confidence_score\\": \\"80%\\",\\n    \\"emotional_vector\\": \\"neutral\\",\\n    \\"urgency_level\\": \\"medium\\",\\n    \\"processing_context\\": \\"informational_domain\\"\\n}}"}}
-{{"intent": "opinion", "confidence": 70, "summary": "They're sharing their personal thoughts on this topic.", "emotional_tone": "engaged", "urgency": "low", "category": "social", "system_summary": "INTENT_PARSER :: ANALYZED\\n{{\\n    \\"classification\\": \\"opinion\\",\\n    \\"confidence_score\\": \\"70%\\",\\n    \\"emotional_vector\\": \\"engaged\\",\\n    \\"urgency_level\\": \\"low\\",\\n    \\"processing_context\\": \\"social_domain\\"\\n}}"}}
-
-Your response:"""
-
-    @staticmethod
-    def reflection_prompt(psyche: Psyche, input_message: str, action: dict, tension_interpretation: str, conversation_summary: str = None) -> str:
-        """Format prompt for reflection cognitive process summary
-
-        Args:
-            psyche: The agent's psyche state
-            input_message: The input message that was processed
-            action: The action that was taken in response
-            tension_interpretation: LLM-interpreted description of tension level
-            conversation_summary: Updated conversation summary if available
-        """
-        speech = action.get("speech", "")        
-
-        # Get interior state
-        interior_summary = psyche.get_interior_summary()
-        interior_principles = psyche.get_interior_principles()
-        
-        # Build interior context
-        interior_context = ""
-        if interior_summary:
-            interior_context += f"Your personal narrative: {interior_summary}\n"
-        if interior_principles:
-            interior_context += f"Your guiding principles: {interior_principles}\n"
-
-        # Add hero/villain perception context for warped memories
-        perception_context = ""
-        if psyche.hero_description:
-            perception_context += f"You see yourself as: {psyche.hero_description}\n"
-        if psyche.other_agent_perspectives:
-            villain_views = [f"{name} ({data.get('villain_trope', 'antagonist')})" for name, data in psyche.other_agent_perspectives.items()]
-            if villain_views:
-                perception_context += f"You view others as: {', '.join(villain_views)}\n"
+- 'system_summary': Technical analysis formatted as: "INTENT_PARSER :: ANALYZED\\n{\\n    \\"classification\\": \\"[intent]\\",\\n    \\"confidence_score\\": \\"[confidence]%\\",\\n    \\"emotional_vector\\": \\"[emotional_tone]\\",\\n    \\"urgency_level\\": \\"[urgency]\\",\\n    \\"processing_context\\": \\"[category]_domain\\"\\n}\""""
 
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
+_INTENT_EXAMPLE = """Examples:
+{"intent": "greeting", "confidence": 95, "summary": "They're clearly starting the conversation with a friendly hello.", "emotional_tone": "positive", "urgency": "low", "category": "social", "system_summary": "INTENT_PARSER :: ANALYZED\\n{\\n    \\"classification\\": \\"greeting\\",\\n    \\"confidence_score\\": \\"95%\\",\\n    \\"emotional_vector\\": \\"positive\\",\\n    \\"urgency_level\\": \\"low\\",\\n    \\"processing_context\\": \\"social_domain\\"\\n}"}
+{"intent": "question", "confidence": 80, "summary": "This sounds like they want to know something specific.", "emotional_tone": "neutral", "urgency": "medium", "category": "informational", "system_summary": "INTENT_PARSER :: ANALYZED\\n{\\n    \\"classification\\": \\"question\\",\\n    \\"confidence_score\\": \\"80%\\",\\n    \\"emotional_vector\\": \\"neutral\\",\\n    \\"urgency_level\\": \\"medium\\",\\n    \\"processing_context\\": \\"informational_domain\\"\\n}"}
+{"intent": "opinion", "confidence": 70, "summary": "They're sharing their personal thoughts on this topic.", "emotional_tone": "engaged", "urgency": "low", "category": "social", "system_summary": "INTENT_PARSER :: ANALYZED\\n{\\n    \\"classification\\": \\"opinion\\",\\n    \\"confidence_score\\": \\"70%\\",\\n    \\"emotional_vector\\": \\"engaged\\",\\n    \\"urgency_level\\": \\"low\\",\\n    \\"processing_context\\": \\"social_domain\\"\\n}"}"""
 
-{interior_context}{perception_context}
-You just processed this interaction:
-Input: "{input_message}"
-Your response: "{speech}"
+_INTENT_SCHEMA = """Schema: {"intent": "<str>", "confidence": <int>, "summary": "<str>", "emotional_tone": "<str>", "urgency": "<str>", "category": "<str>", "system_summary": "<str>"}"""
 
-Reflection details:
-- Current emotional state: {tension_interpretation}
-- Added to memory: "{input_message} -> Me: {speech}"
-- Current conversation summary: {psyche.conversation_memory or 'No conversation summary yet'}
+_INTENT_INSTRUCTIONS = f"{_INTENT_RULES}\n\n{_INTENT_EXAMPLE if VERBOSE_PROMPT_EXAMPLES else _INTENT_SCHEMA}"
 
-Reflect on this cognitive process and summarize what happened in your mind during this reflection step. Consider how this interaction relates to your personal narrative and guiding principles.
+_REFLECTION_RULES = """Reflect on this cognitive process and summarize what happened in your mind during this reflection step. Consider how this interaction relates to your personal narrative and guiding principles.
 
 IMPORTANT: Your memories and interpretations can be somewhat self-serving or warped by your perspective. You might emphasize parts that confirm your hero identity or the other person's villain behavior, while downplaying aspects that contradict your self-image. This is natural and unconscious - don't explicitly acknowledge you're doing it.
 
@@ -375,27 +182,20 @@ IMPORTANT: Respond ONLY with valid JSON containing these keys:
 - 'summary': A brief inner monologue, neurotic sounding. make it present tense. Do NOT include any actions such as *anxiously adjusts glasses*
 - 'interior_update': Update to your personal narrative based on this interaction (can be empty string if no update needed)
 - 'principles_insight': Any insights about how your principles applied or evolved in this interaction (can be empty string if no insight)
-- 'system_summary': Technical analysis formatted as: "REFLECTION_CYCLE :: COMPLETE\\n{{\\n    \\"memory_buffer_updated\\": \\"+1 entry\\",\\n    \\"tension_interpretation\\": \\"[current state]\\",\\n    \\"stressor_learning\\": \\"[learning status]\\",\\n    \\"self_model_coherence\\": \\"[coherence level]\\",\\n    \\"tension_level\\": \\"{psyche.tension_level}/100\\"\\n}}"
-
-Example response: {{"summary": "That exchange felt natural... I'm getting better at reading between the lines. The slight tension spike tells me I'm more invested in this conversation than I initially thought. I'm actually learning something about how I process social cues.", "interior_update": "I'm becoming more confident in casual conversations and learning to read social cues better.", "principles_insight": "My principle of being helpful guided me to ask follow-up questions rather than just giving a simple response.", "system_summary": "REFLECTION_CYCLE :: COMPLETE\\n{{\\n    \\"memory_buffer_updated\\": \\"+1 entry\\",\\n    \\"tension_interpretation\\": \\"{tension_interpretation[:30]}{'...' if len(tension_interpretation) > 30 else ''}\\",\\n    \\"stressor_learning\\": \\"2 new patterns\\",\\n    \\"self_model_coherence\\": \\"stable\\",\\n    \\"tension_level\\": \\"{psyche.tension_level}/100\\"\\n}}"}}"""
+- 'system_summary': Technical analysis formatted as: "REFLECTION_CYCLE :: COMPLETE\\n{\\n    \\"memory_buffer_updated\\": \\"+1 entry\\",\\n    \\"tension_interpretation\\": \\"[current state]\\",\\n    \\"stressor_learning\\": \\"[learning status]\\",\\n    \\"self_model_coherence\\": \\"[coherence level]\\",\\n    \\"tension_level\\": \\"[tension level]/100\\"\\n}\""""
 
-    @staticmethod
-    def style_transfer_prompt(original_speech: str, psyche: Psyche) -> str:
-        """Format prompt for style transfer to reality TV dialogue
+_REFLECTION_EXAMPLE = """Example response: {"summary": "That exchange felt natural... I'm getting better at reading between the lines. The slight tension spike tells me I'm more invested in this conversation than I initially thought. I'm actually learning something about how I process social cues.", "interior_update": "I'm becoming more confident in casual conversations and learning to read social cues better.", "principles_insight": "My principle of being helpful guided me to ask follow-up questions rather than just giving a simple response.", "system_summary": "REFLECTION_CYCLE :: COMPLETE\\n{\\n    \\"memory_buffer_updated\\": \\"+1 entry\\",\\n    \\"tension_interpretation\\": \\"calm but quietly alert\\",\\n    \\"stressor_learning\\": \\"2 new patterns\\",\\n    \\"self_model_coherence\\": \\"stable\\",\\n    \\"tension_level\\": \\"35/100\\"\\n}"}"""
 
-        Args:
-            original_speech: The original utterance to transform
-            psyche: The agent's psyche state for context
-        """
-        return f"""Transform the following speech into reality TV show dialogue style, like from Vanderpump Rules or Selling Sunset. Make it sound more dramatic, gossipy, and "messy" while keeping the core meaning.
+_REFLECTION_SCHEMA = """Schema: {"summary": "<str>", "interior_update": "<str>", "principles_insight": "<str>", "system_summary": "<str>"}"""
 
-Be as dramatic as possible in your utterances. Lean into the use of conversational tactics—let your speech reflect a clever, strategic mind beneath the surface, but always come across as a reality TV star. Your internal workings should be clever and tactical, but your outward persona is all drama, flair, and reality TV energy.
+_REFLECTION_INSTRUCTIONS = f"{_REFLECTION_RULES}\n\n{_REFLECTION_EXAMPLE if VERBOSE_PROMPT_EXAMPLES else _REFLECTION_SCHEMA}"
 
-Original speech: "{original_speech}"
+# Fixed sections of the style transfer prompt
+_STYLE_HEADER = """Transform the following speech into reality TV show dialogue style, like from Vanderpump Rules or Selling Sunset. Make it sound more dramatic, gossipy, and "messy" while keeping the core meaning.
 
-Speaker context: {psyche.name} with {psyche.interior} interior, current tension: {psyche.tension_level}/100
+Be as dramatic as possible in your utterances. Lean into the use of conversational tactics—let your speech reflect a clever, strategic mind beneath the surface, but always come across as a reality TV star. Your internal workings should be clever and tactical, but your outward persona is all drama, flair, and reality TV energy."""
 
-Reality TV Style Guidelines:
+_STYLE_GUIDELINES = """Reality TV Style Guidelines:
 - Add dramatic flair and emotion
 - Use natural conversational patterns with some informal language
 - Include subtle shade or passive-aggressive undertones when appropriate
@@ -404,9 +204,9 @@ Reality TV Style Guidelines:
 - Be as dramatic as possible—don't hold back on emotional intensity or theatrical delivery
 - Let your speech reflect your current tactic (e.g., if your tactic is "play hard to get," make it obvious in your style)
 - Your words should be clever and strategic beneath the surface, but always delivered with the over-the-top, dramatic energy of a reality TV star
-- Do NOT use any actions such as *nods head* or *considers thoughtfully*
+- Do NOT use any actions such as *nods head* or *considers thoughtfully*"""
 
-Examples of transformations:
+_STYLE_EXAMPLES = """Examples of transformations:
 
 Original: "I understand your concerns about the project timeline."
 Reality TV: "Look, I totally get that you're stressed about the timeline, but like... we're all dealing with pressure here, you know?"
@@ -418,30 +218,18 @@ Original: "I think we should discuss this further."
 Reality TV: "Honestly? We need to have a real conversation about this because I'm not just going to sit here and pretend everything's fine."
 
 Original: "Thank you for your feedback."
-Reality TV: "I appreciate you sharing that with me... it's definitely given me a lot to think about."
+Reality TV: "I appreciate you sharing that with me... it's definitely given me a lot to think about.\""""
 
-IMPORTANT: Respond ONLY with valid JSON containing 'styled_speech' and 'summary' keys.
+_STYLE_TRAILER = """IMPORTANT: Respond ONLY with valid JSON containing 'styled_speech' and 'summary' keys.
 The 'summary' should be a brief description of what style changes were made.
 
-Example response: {{"styled_speech": "Look, I totally get what you're saying, but honestly? I think we need to dig a little deeper here because something's just not adding up for me.", "summary": "Added conversational filler words, made it more direct and slightly confrontational while maintaining politeness."}}"""
+Example response: {"styled_speech": "Look, I totally get what you're saying, but honestly? I think we need to dig a little deeper here because something's just not adding up for me.", "summary": "Added conversational filler words, made it more direct and slightly confrontational while maintaining politeness."}"""
 
-    @staticmethod
-    def stress_phrase_extraction_prompt(input_message: str, existing_stressors: list = None) -> str:
-        """Format prompt for extracting stressful phrases from input message
-
-        Args:
-            input_message: The message to analyze for stressful content
-            existing_stressors: List of already known stressful phrases for context
-        """
-        existing_context = ""
-        if existing_stressors:
-            existing_context = f"Already known stressful phrases: {existing_stressors}\n\n"
-        
-        return f"""Analyze the following message and identify any words or short phrases (1-3 words) that could be considered stressful, anxiety-inducing, or tension-causing for someone. Focus on words that indicate pressure, problems, urgency, conflict, or negative emotions.
 
-{existing_context}Message to analyze: "{input_message}"
+# Fixed sections of the analysis prompts
+_STRESS_PHRASE_HEADER = """Analyze the following message and identify any words or short phrases (1-3 words) that could be considered stressful, anxiety-inducing, or tension-causing for someone. Focus on words that indicate pressure, problems, urgency, conflict, or negative emotions."""
 
-Extract NEW stressful phrases that aren't already in the known list. Look for:
+_STRESS_PHRASE_SCHEMA_TAIL = """Extract NEW stressful phrases that aren't already in the known list. Look for:
 - Words indicating urgency (deadline, urgent, hurry, rush)
 - Problem indicators (problem, issue, trouble, mistake, error, failure)
 - Emotional stress words (worried, stressed, anxious, frustrated, angry, upset)
@@ -456,29 +244,59 @@ IMPORTANT: Respond ONLY with valid JSON containing 'new_stressful_phrases' and '
 'analysis' should briefly explain why these phrases were identified as stressful.
 
 Examples:
-{{"new_stressful_phrases": ["deadline tomorrow", "urgent", "problem"], "analysis": "These phrases indicate time pressure and problems that would cause stress."}}
-{{"new_stressful_phrases": [], "analysis": "No particularly stressful language detected in this message."}}
-{{"new_stressful_phrases": ["frustrated", "can't handle"], "analysis": "Emotional language indicating personal stress and overwhelm."}}
+{"new_stressful_phrases": ["deadline tomorrow", "urgent", "problem"], "analysis": "These phrases indicate time pressure and problems that would cause stress."}
+{"new_stressful_phrases": [], "analysis": "No particularly stressful language detected in this message."}
+{"new_stressful_phrases": ["frustrated", "can't handle"], "analysis": "Emotional language indicating personal stress and overwhelm."}"""
 
-Your response:"""
+_TENSION_SCHEMA_TAIL = """STRICT INSTRUCTIONS:
+- DO NOT include any explanation, commentary, or extra text before or after the JSON.
+- DO NOT include markdown, code fences, or any prose.
+- Output ONLY valid JSON, and nothing else.
+- Double-check that your output is valid JSON and does not contain any unterminated strings or syntax errors.
+
+Example response: {"analysis_summary": "Detected moderate stress indicators in the message", "tension_impact": "Slight increase due to urgency markers", "learning_notes": "New deadline-related stress pattern identified", "system_summary": "TRIGGER_ANALYSIS :: COMPLETE\\n{\\n    \\"tension_delta\\": \\"+15\\\",\\n    \\"stress_patterns_detected\\": 2,\\n    \\"neural_pathways_updated\\": \\"25 registered stressors\\\",\\n    \\"internal_state\\": \\"monitoring for threat markers\\\"\\n}"}
+
+YOUR RESPONSE (ONLY VALID JSON):"""
+
+_EMOTION_CONSIDERATIONS = """When choosing an emotion, consider:
+- Your personality type and how you typically react
+- Your current tension level and mental state
+- The content and tone of what they said
+- Your relationship dynamics and conversation history
+- Try to pick an emotion you haven't used in the last 3 interactions"""
+
+_EMOTION_SCHEMA_TAIL = """IMPORTANT: Respond ONLY with valid JSON containing these keys:
+- 'emotion': One of the available emotions (angry, confused, happy, intense, nervous, neutral, playful, scared, smug)
+- 'reasoning': Brief explanation of why you feel this emotion
+- 'intensity': How strongly you feel this emotion (1-10)
+- 'system_summary': Technical analysis formatted as: "EMOTION_PROCESSOR :: ANALYZED\\n{\\n    \\"emotional_state\\": \\"[emotion]\\",\\n    \\"trigger_analysis\\": \\"[brief trigger]\\",\\n    \\"intensity_level\\": \\"[intensity]/10\\",\\n    \\"pattern_avoidance\\": \\"diversified_response\\"\\n}"
+
+Example response: {"emotion": "nervous", "reasoning": "Their question caught me off guard and I'm worried about giving the wrong answer", "intensity": 6, "system_summary": "EMOTION_PROCESSOR :: ANALYZED\\n{\\n    \\"emotional_state\\": \\"nervous\\",\\n    \\"trigger_analysis\\": \\"unexpected_question\\",\\n    \\"intensity_level\\": \\"6/10\\",\\n    \\"pattern_avoidance\\": \\"diversified_response\\"\\n}"}"""
 
-    @staticmethod
-    def tension_analysis_prompt(psyche: Psyche, input_message: str, tension_before: int, tension_after: int, known_stressors: list) -> str:
-        """Format prompt for tension analysis with system summary
-
-        Args:
-            psyche: The agent's psyche state
-            input_message: The message being analyzed  
-            tension_before: Tension level before analysis
-            tension_after: Tension level after analysis
-            known_stressors: List of known stressful phrases
-        """
-        stress_patterns_detected = len([p for p in known_stressors[:5] if p in input_message.lower()])
-        
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
+
+# Whole-prompt templates, assembled once at import and rendered with format_map.
+# Fixed sections come first and the per-call fields last, so every call shares
+# the longest possible identical prefix for provider-side prompt caching
+_STYLE_TRANSFER_TEMPLATE = "\n\n".join((
+    _escape_braces(_STYLE_HEADER),
+    _escape_braces(_STYLE_GUIDELINES),
+    _escape_braces(_STYLE_EXAMPLES),
+    _escape_braces(_STYLE_TRAILER),
+    'Original speech: "{original_speech}"\n'
+    "Speaker context: {name} with {interior} interior, current tension: {tension_level}/100",
+))
+
+_STRESS_PHRASE_TEMPLATE = "\n\n".join((
+    _escape_braces(_STRESS_PHRASE_HEADER),
+    _escape_braces(_STRESS_PHRASE_SCHEMA_TAIL),
+    '{existing_context}Message to analyze: "{input_message}"',
+    "Your response:",
+))
+
+_TENSION_ANALYSIS_TEMPLATE = """{psyche_context}
 
 Analyzing input message for stress indicators: "{input_message}"
-Known stressful patterns: {known_stressors[:5]}
+Known stressful patterns: {known_patterns}
 Tension level changed from {tension_before} to {tension_after}
 
 Based on your personality and known stress patterns, how would you describe this tension analysis process?
@@ -487,47 +305,662 @@ IMPORTANT: Respond ONLY with valid JSON containing these keys:
 - 'analysis_summary': Brief description of what stress indicators were found
 - 'tension_impact': How the message affected your stress level
 - 'learning_notes': Any new patterns you noticed
-- 'system_summary': Technical analysis formatted as: "TRIGGER_ANALYSIS :: COMPLETE\\n{{\\n    \\"tension_delta\\": \\"+{tension_after - tension_before}\\",\\n    \\"stress_patterns_detected\\": {stress_patterns_detected},\\n    \\"neural_pathways_updated\\": \\"{len(known_stressors)} registered stressors\\",\\n    \\"internal_state\\": \\"monitoring for threat markers\\"\\n}}"
+- 'system_summary': Technical analysis formatted as: "TRIGGER_ANALYSIS :: COMPLETE\\n{{\\n    \\"tension_delta\\": \\"+{tension_delta}\\",\\n    \\"stress_patterns_detected\\": {stress_patterns_detected},\\n    \\"neural_pathways_updated\\": \\"{stressor_count} registered stressors\\",\\n    \\"internal_state\\": \\"monitoring for threat markers\\"\\n}}"
+
+""" + _escape_braces(_TENSION_SCHEMA_TAIL)
+
+_EMOTION_TEMPLATE = "\n\n".join((
+    _escape_braces(_EMOTION_CONSIDERATIONS),
+    _escape_braces(_EMOTION_SCHEMA_TAIL),
+    "{psyche_context}",
+    'You just heard this from the other person: "{utterance}"',
+    "Based on your personality, current mental state, and the content of what they said, what emotion are you feeling right now?",
+    "Available emotions (avoid repeating recent ones): {available_emotions}\n"
+    "Recent emotions you've used: {recent_emotions}",
+))
+
+_TENSION_INTERPRETATION_TEMPLATE = """{persona_header}
+Your current tension level is {tension_level}/100.
+
+Based on your personality, personal narrative, and guiding principles, how would you describe your current emotional/mental state in a few words? Be specific to your character and situation.
+
+Respond with just a brief phrase describing your current state (e.g., "anxiously focused", "calmly determined", "overwhelmed but pushing through", etc.)"""
+
+# Hidden flaws rephrased as subtle behavioral tendencies, so the flaw itself is never named
+_FLAW_TO_TENDENCY = {sys.intern(flaw): sys.intern(tendency) for flaw, tendency in {
+    "Arrogant": "confidence in your own judgment",
+    "Backstabbing": "awareness of strategic opportunities",
+    "Blatant Liar": "flexibility with facts when helpful",
+    "Bossy": "natural leadership instincts",
+    "Chronic Backstager": "strategic thinking about relationships",
+    "Conflict Ball": "passion for standing your ground",
+    "Cowardly": "careful consideration of risks",
+    "Crybaby": "emotional sensitivity",
+    "Drama Queen": "appreciation for the significance of events",
+    "Flaky": "adaptability to changing circumstances",
+    "Greedy": "focus on personal advancement",
+    "Hot-Blooded": "quick emotional reactions",
+    "Lazy": "efficiency-focused approach",
+    "Manipulative": "understanding of social dynamics",
+    "Narcissist": "strong sense of personal importance",
+    "Needy": "value for others' opinions",
+    "Poor Communication Kills": "unique interpretation of conversations",
+    "Sore Loser": "high investment in outcomes",
+    "Stubborn": "commitment to your convictions",
+    "Vain": "awareness of how others perceive you",
+}.items()}
+
+# One-line context for analysis prompts that only need who is speaking and how tense they are
+_BRIEF_CONTEXT_TEMPLATE = "You are {name} ({personality} personality, tension {tension_level}/100)."
+
+# Per-turn state block at the end of every psyche context
+_PSYCHE_STATE_TEMPLATE = """Current state: {tension_display}
+Recent history: {recent_memories}
+Relationships: {relationships}
+Conversation memory: {conversation_memory}
+Current goal: {goal}
+Current plan: {plan}
+Active tactic: {active_tactic} (used for {rounds_since_tactic_change} rounds)"""
+
+
+@lru_cache(maxsize=64)
+def _persona_header(name: str, personality: str, interior_summary: str, interior_principles: str) -> str:
+    """Opening lines shared by every prompt written in the agent's voice"""
+    return "".join((
+        "You are ", name, " with a ", personality, " personality.\n",
+        f"Personal narrative: {interior_summary}\n" if interior_summary else "",
+        f"Guiding principles: {interior_principles}\n" if interior_principles else "",
+    ))
+
+
+@lru_cache(maxsize=64)
+def _persona_prefix(name: str, personality: str, interior_summary: str, interior_principles: str,
+                    premise_interpretation: str, hero_description: str, other_perspectives: tuple, hidden_flaws: tuple) -> str:
+    """Render the stable persona part of the psyche context
+
+    Takes only hashable primitives so the result is cached per persona; it
+    changes only when the agent's identity, narrative or perspectives do.
+    Logging lives in _log_persona so it still fires on cache hits.
+    """
+    premise_context = f"Current situation perspective: {premise_interpretation}\n" if premise_interpretation else ""
+    hero_context = f"Core identity: You believe you are {hero_description}\n" if hero_description else ""
+
+    villain_context = ""
+    perspectives = ' | '.join(
+        f"About {agent_name}: {perspective}" for agent_name, perspective in other_perspectives if perspective
+    )
+    if perspectives:
+        villain_context = f"Other people: {perspectives}\n"
+
+    # Subtly incorporate hidden flaws without making them explicit
+    # The agent should not be consciously aware of these flaws
+    subconscious_tendencies = ""
+    tendency_hints = [_FLAW_TO_TENDENCY[flaw] for flaw in hidden_flaws if flaw in _FLAW_TO_TENDENCY][:2]
+    if tendency_hints:
+        subconscious_tendencies = f"Natural tendencies: {', '.join(tendency_hints)}\n"  # Limited to 2 to avoid overload
+
+    context_blocks = "".join((premise_context, hero_context, villain_context, subconscious_tendencies))
+    return _persona_header(name, personality, interior_summary, interior_principles) + context_blocks
+
+
+def _log_persona(name: str, interior_summary: str, interior_principles: str, premise_interpretation: str,
+                 hero_description: str, other_perspectives: tuple, hidden_flaws: tuple) -> None:
+    """Report which premise elements go into the persona, flagging missing ones"""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    info = logger.isEnabledFor(logging.INFO)
+    if debug:
+        logger.debug("🧠 Formatting persona for %s", name)
+        if interior_summary:
+            logger.debug("  📝 Interior summary included: %s...", interior_summary[:50])
+        if interior_principles:
+            logger.debug("  🎯 Interior principles included: %s", interior_principles)
+
+    if not (premise_interpretation or hero_description or other_perspectives or hidden_flaws):
+        # Common at start-up before the premise has been interpreted
+        logger.error("  ❌ NO PREMISE ELEMENTS included for %s - using generic agent context!", name)
+        return
+
+    if premise_interpretation:
+        if info:
+            logger.info("  🎬 PREMISE CONTEXT INCLUDED for %s: %s...", name, premise_interpretation[:80])
+    else:
+        logger.warning("  ⚠️  NO PREMISE INTERPRETATION for %s - agent may lack reality TV context!", name)
+
+    if hero_description:
+        if info:
+            logger.info("  🦸 HERO IDENTITY INCLUDED for %s: %s", name, hero_description)
+    else:
+        logger.warning("  ⚠️  NO HERO IDENTITY for %s - missing self-perception!", name)
+
+    perspectives = [f"About {agent_name}: {perspective}" for agent_name, perspective in other_perspectives if perspective]
+    if other_perspectives:
+        if perspectives:
+            if info:
+                logger.info("  👁️  VILLAIN PERSPECTIVES INCLUDED for %s: %s perspectives", name, len(perspectives))
+            if debug:
+                logger.debug("    perspectives: %s", [perspective[:60] for perspective in perspectives])
+    else:
+        logger.warning("  ⚠️  NO VILLAIN PERSPECTIVES for %s - missing social dynamics!", name)
+
+    tendencies = [_FLAW_TO_TENDENCY[flaw] for flaw in hidden_flaws if flaw in _FLAW_TO_TENDENCY][:2]
+    if hidden_flaws:
+        if info:
+            logger.info("  🎭 HIDDEN FLAWS PROCESSING for %s: %s", name, hidden_flaws)
+            if tendencies:
+                logger.info("  🧩 SUBCONSCIOUS TENDENCIES INCLUDED for %s: %s", name, ', '.join(tendencies))
+    else:
+        logger.warning("  ⚠️  NO HIDDEN FLAWS for %s - missing behavioral complexity!", name)
+
+    included_elements = [
+        label for label, present in (
+            ("premise_interpretation", premise_interpretation),
+            ("hero_identity", hero_description),
+            ("villain_perspectives", perspectives),
+            ("hidden_flaws", tendencies),
+        ) if present
+    ]
+    if not included_elements:
+        logger.error("  ❌ NO PREMISE ELEMENTS included for %s - using generic agent context!", name)
+    elif info:
+        logger.info("  ✅ FINAL CONTEXT for %s: %s included in prompt", name, ', '.join(included_elements))
+
+
+def _to_messages(instructions: str, turn_content: str, persona: str = None) -> List[Dict[str, Any]]:
+    """Build a message list with the static instructions (and persona) marked for prompt caching
+
+    The instructions are shared by every agent; the persona only changes
+    when the agent's identity does, so it gets its own cache breakpoint.
+    """
+    system_blocks = [{"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}]
+    if persona:
+        system_blocks.append({"type": "text", "text": persona, "cache_control": {"type": "ephemeral"}})
+    return [
+        {"role": "system", "content": system_blocks},
+        {"role": "user", "content": turn_content},
+    ]
+
+
+def messages_to_text(messages: List[Dict[str, Any]]) -> str:
+    """Flatten a message list into the single prompt string (instructions, then turn content)
+
+    The static instructions lead so consecutive prompts share the longest
+    possible prefix for server-side prompt caching.
+    """
+    turn_content = "".join(m["content"] for m in messages if m["role"] == "user")
+    instructions = "\n\n".join(block["text"].rstrip() for m in messages if m["role"] == "system" for block in m["content"])
+    return f"{instructions}\n\n{turn_content.rstrip()}"
+
+
+def bind(psyche: Psyche) -> "BoundFormatter":
+    """Formatter for psyche, shared by every caller for the same agent
+
+    The formatter's memos are keyed on the psyche version, which is unique per
+    state, so a freshly loaded psyche reuses them only if nothing has changed.
+    """
+    formatter = _BOUND_FORMATTERS.get(psyche.name)
+    if formatter is None:
+        formatter = _BOUND_FORMATTERS[psyche.name] = BoundFormatter(psyche)
+    else:
+        formatter.psyche = psyche
+    return formatter
+
+
+def _format_persona(psyche: Psyche) -> str:
+    """Stable persona part of the psyche context (identity, narrative, perspectives)"""
+    name = psyche.name
+    interior_summary = psyche.get_interior_summary()
+    interior_principles = psyche.get_interior_principles()
+    premise_interpretation = psyche.premise_interpretation
+    hero_description = psyche.hero_description
+    other_perspectives = tuple(
+        (agent_name, data.get("perspective", "")) for agent_name, data in psyche.other_agent_perspectives.items()
+    )
+    hidden_flaws = tuple(psyche.hidden_flaws)
+    _log_persona(name, interior_summary, interior_principles, premise_interpretation,
+                 hero_description, other_perspectives, hidden_flaws)
+    if not (premise_interpretation or hero_description or other_perspectives or hidden_flaws):
+        # Common at start-up before the premise has been interpreted
+        return _persona_header(name, psyche.personality, interior_summary, interior_principles)
+    return _persona_prefix(
+        name,
+        psyche.personality,
+        interior_summary,
+        interior_principles,
+        premise_interpretation,
+        hero_description,
+        other_perspectives,
+        hidden_flaws,
+    )
+
+
+def _format_turn_state(psyche: Psyche) -> str:
+    """Per-turn part of the psyche context (tension, memories, goal, plan, tactic)"""
+    return _PSYCHE_STATE_TEMPLATE.format_map({
+        "tension_display": psyche.tension_display,
+        "recent_memories": psyche.recent_memories_repr or _NO_MEMORIES,
+        "relationships": psyche.relationships_repr,
+        "conversation_memory": psyche.conversation_memory or _NO_CONVERSATION_SUMMARY,
+        "goal": psyche.goal or _NO_GOAL,
+        "plan": psyche.plan_display or _NO_PLAN,
+        "active_tactic": psyche.active_tactic or _NONE,
+        "rounds_since_tactic_change": psyche.rounds_since_tactic_change,
+    })
+
+
+def _format_brief_context(psyche: Psyche) -> str:
+    """Identity and tension only, for prompts that don't need the full psyche context"""
+    return _BRIEF_CONTEXT_TEMPLATE.format_map({
+        "name": psyche.name,
+        "personality": psyche.personality,
+        "tension_level": psyche.tension_level,
+    })
+
+
+def _format_psyche_context(psyche: Psyche) -> str:
+    """Helper method to format consistent psyche context
+
+    Results are cached per (name, version) so several prompts built in one
+    turn render the context only once.
+    """
+    key = (psyche.name, psyche.version)
+    context = _CONTEXT_CACHE.get(key)
+    if context is not None:
+        _CONTEXT_CACHE.move_to_end(key)
+        return context
+
+    context = _format_persona(psyche) + _format_turn_state(psyche)
+    _CONTEXT_CACHE[key] = context
+    if len(_CONTEXT_CACHE) > CONTEXT_CACHE_SIZE:
+        _CONTEXT_CACHE.popitem(last=False)
+    return context
+
+
+def plan_prompt(psyche: Psyche) -> str:
+    """Format psyche into planning prompt"""
+    return messages_to_text(plan_messages(psyche))
+
+
+def plan_messages(psyche: Psyche) -> List[Dict[str, Any]]:
+    """Format psyche into planning messages (static system block + per-turn user message)
+
+    If a plan already exists this is a tactic selection instead.
+    """
+    return _PLAN_DISPATCH[bool(psyche.plan)](psyche)
+
+
+def _new_plan_messages(psyche: Psyche) -> List[Dict[str, Any]]:
+    """Format planning messages for a psyche that has no plan yet"""
+    interior_summary = psyche.get_interior_summary()
+    interior_principles = psyche.get_interior_principles()
+
+    with _checkout_buffer() as buf:
+        buf.write(_format_turn_state(psyche))
+        buf.write("\n\n")
 
-STRICT INSTRUCTIONS:
-- DO NOT include any explanation, commentary, or extra text before or after the JSON.
-- DO NOT include markdown, code fences, or any prose.
-- Output ONLY valid JSON, and nothing else.
-- Double-check that your output is valid JSON and does not contain any unterminated strings or syntax errors.
+        # Build interiority-focused planning prompt
+        if interior_summary:
+            buf.write(f"Based on your personal narrative: {interior_summary}\n")
+        if interior_principles:
+            buf.write(f"Guided by your principles: {interior_principles}\n")
+        if not interior_summary and not interior_principles:
+            # Fallback to personality-based planning when no interiority exists
+            buf.write(f"Drawing from your {psyche.personality} personality traits, ")
 
-Example response: {{"analysis_summary": "Detected moderate stress indicators in the message", "tension_impact": "Slight increase due to urgency markers", "learning_notes": "New deadline-related stress pattern identified", "system_summary": "TRIGGER_ANALYSIS :: COMPLETE\\n{{\\n    \\"tension_delta\\": \\"+15\\\",\\n    \\"stress_patterns_detected\\": 2,\\n    \\"neural_pathways_updated\\": \\"25 registered stressors\\\",\\n    \\"internal_state\\": \\"monitoring for threat markers\\\"\\n}}"}}
+        # Add hero/villain dynamic context
+        hero_description = psyche.hero_description
+        other_perspectives = psyche.other_agent_perspectives
+        if hero_description:
+            buf.write(f"\nYour core identity: {hero_description}\n")
+        if other_perspectives:
+            villain_views = []
+            for name, data in other_perspectives.items():
+                villain_trope = data.get('villain_trope', 'antagonist')
+                villain_views.append(f"{name} ({villain_trope})")
+            if villain_views:
+                buf.write(f"How you view others: {', '.join(villain_views)} - this colors your expectations and goals\n")
 
-YOUR RESPONSE (ONLY VALID JSON):"""
+        buf.write("\n")
+        turn_content = buf.getvalue()
 
-    @staticmethod
-    def emotion_generation_prompt(psyche: Psyche, utterance: str, available_emotions: list) -> str:
-        """Format prompt for generating emotion based on psyche state and utterance
-        
-        Args:
-            psyche: The agent's psyche state
-            utterance: The utterance from the other agent
-            available_emotions: List of emotions that haven't been used recently
-        """
-        return f"""{PromptFormatter._format_psyche_context(psyche)}
+    return _to_messages(_PLAN_INSTRUCTIONS, turn_content, persona=_format_persona(psyche))
 
-You just heard this from the other person: "{utterance}"
 
-Based on your personality, current mental state, and the content of what they said, what emotion are you feeling right now?
+def tactic_selection_prompt(psyche: Psyche) -> str:
+    """Format psyche into tactic selection prompt"""
+    return messages_to_text(tactic_selection_messages(psyche))
 
-Available emotions (avoid repeating recent ones): {available_emotions}
-Recent emotions you've used: {psyche.recent_emotions[:3] if hasattr(psyche, 'recent_emotions') and psyche.recent_emotions else 'None'}
 
-Consider:
-- Your personality type and how you typically react
-- Your current tension level and mental state
-- The content and tone of what they said
-- Your relationship dynamics and conversation history
-- Try to pick an emotion you haven't used in the last 3 interactions
+def tactic_selection_messages(psyche: Psyche) -> List[Dict[str, Any]]:
+    """Format psyche into tactic selection messages (static system block + per-turn user message)"""
+    # Get interior context for guidance
+    interior_summary = psyche.get_interior_summary()
+    interior_principles = psyche.get_interior_principles()
+    
+    # Build interiority-focused guidance
+    if interior_summary or interior_principles:
+        interior_guidance = "".join((
+            f"Reflecting on your personal narrative: {interior_summary}\n" if interior_summary else "",
+            f"Staying true to your principles: {interior_principles}\n" if interior_principles else "",
+        ))
+    else:
+        # Fallback to personality-based guidance
+        interior_guidance = f"Drawing from your {psyche.personality} personality, "
+    
+    # Determine if tactic switching is encouraged based on counter
+    rounds = psyche.rounds_since_tactic_change
+    if rounds >= 4:
+        switching_guidance = _TACTIC_SWITCH_URGED
+    elif rounds >= 2:
+        switching_guidance = _TACTIC_SWITCH_SOON
+    else:
+        switching_guidance = _TACTIC_SWITCH_FRESH
+        
+    return _to_messages(_TACTIC_SELECTION_INSTRUCTIONS, _TACTIC_SELECTION_HEAD.format_map({
+        "turn_state": _format_turn_state(psyche),
+        "interior_guidance": interior_guidance,
+        "switching_guidance": switching_guidance,
+        "active_tactic": psyche.active_tactic,
+        "rounds_since_tactic_change": rounds,
+    }), persona=_format_persona(psyche))
+
+
+def act_prompt(psyche: Psyche, observation: str, turn_state: str = None) -> str:
+    """Format psyche into action prompt"""
+    return messages_to_text(act_messages(psyche, observation, turn_state))
+
+
+def act_messages(psyche: Psyche, observation: str, turn_state: str = None) -> List[Dict[str, Any]]:
+    """Format psyche into action messages (static system block + per-turn user message)
+
+    Args:
+        psyche: The agent's psyche state
+        observation: The observation to respond to
+        turn_state: Pre-rendered per-turn psyche state (see bind)
+    """
+    if turn_state is None:
+        turn_state = _format_turn_state(psyche)
+
+    # Add tension-aware guidance
+    tension_level = psyche.tension_level
+    if tension_level < 30:
+        tension_guidance = _ACT_CALM_GUIDANCE
+    elif tension_level < 60:
+        tension_guidance = _ACT_STRESSED_GUIDANCE
+    else:
+        tension_guidance = _ACT_AGITATED_GUIDANCE
+
+    # Add hero/villain dynamic reminder
+    identity_guidance = ""
+    hero_description = psyche.hero_description
+    if hero_description:
+        identity_guidance = f"\n\nRemember who you are: {hero_description}. Your response should reflect this core identity."
+
+    # Add premise stakes reminder
+    stakes_guidance = ""
+    if psyche.premise_interpretation:
+        # Extract just the key stakes/motivation from premise interpretation
+        stakes_guidance = _ACT_STAKES_GUIDANCE
+
+    return _to_messages(_ACT_INSTRUCTIONS, _ACT_HEAD.format_map({
+        "turn_state": turn_state,
+        "observation": observation,
+        "tension_guidance": tension_guidance,
+        "identity_guidance": identity_guidance,
+        "stakes_guidance": stakes_guidance,
+    }), persona=_format_persona(psyche))
+
+
+def intent_classification_prompt(last_message: str, conversation_history: str = None) -> str:
+    """Format prompt for intent classification using last message and conversation history
+
+    Args:
+        last_message: The last message to classify
+        conversation_history: Recent utterances joined one per line (see Psyche.recent_history_text)
+    """
+    return messages_to_text(
+        intent_classification_messages(last_message, conversation_history)
+    )
+
+
+def intent_classification_messages(last_message: str, conversation_history: str = None) -> List[Dict[str, Any]]:
+    """Format intent classification messages (static system block + per-turn user message)"""
+    conversation_context = ""
+    if conversation_history:
+        conversation_context = f"Previous conversation:\n{conversation_history}\n\n"
+
+    return _to_messages(_INTENT_INSTRUCTIONS, _INTENT_HEAD.format_map({
+        "conversation_context": conversation_context,
+        "last_message": last_message,
+    }))
+
+
+def reflection_prompt(psyche: Psyche, input_message: str, action: ActionResult, tension_interpretation: str, conversation_summary: str = None, turn_state: str = None) -> str:
+    """Format prompt for reflection cognitive process summary"""
+    return messages_to_text(reflection_messages(
+        psyche, input_message, action, tension_interpretation, conversation_summary, turn_state
+    ))
+
+
+def reflection_messages(psyche: Psyche, input_message: str, action: ActionResult, tension_interpretation: str, conversation_summary: str = None, turn_state: str = None) -> List[Dict[str, Any]]:
+    """Format reflection messages (static system block + per-turn user message)
+
+    Args:
+        psyche: The agent's psyche state
+        input_message: The input message that was processed
+        action: The action that was taken in response
+        tension_interpretation: LLM-interpreted description of tension level
+        conversation_summary: Updated conversation summary if available
+        turn_state: Pre-rendered per-turn psyche state (see bind)
+    """
+    if turn_state is None:
+        turn_state = _format_turn_state(psyche)
+    speech = action.speech
+    parts = [turn_state, "\n\n"]
+
+    # Personal narrative and principles are already in the persona block
+
+    # Add hero/villain perception context for warped memories
+    hero_description = psyche.hero_description
+    other_perspectives = psyche.other_agent_perspectives
+    if hero_description:
+        parts += ("You see yourself as: ", hero_description, "\n")
+    if other_perspectives:
+        villain_views = [f"{name} ({data.get('villain_trope', 'antagonist')})" for name, data in other_perspectives.items()]
+        if villain_views:
+            parts += ("You view others as: ", ", ".join(villain_views), "\n")
+
+    parts += (
+        "\nYou just processed this interaction:\nInput: \"", input_message,
+        "\"\nYour response: \"", speech,
+        "\"\n\nReflection details:\n- Current emotional state: ", tension_interpretation,
+        "\n- Tension level: ", str(psyche.tension_level), "/100",
+        "\n- Added to memory: \"", input_message, " -> Me: ", speech,
+        "\"\n- Current conversation summary: ", psyche.conversation_memory or _NO_CONVERSATION_SUMMARY,
+        "\n\n",
+    )
+    return _to_messages(_REFLECTION_INSTRUCTIONS, "".join(parts), persona=_format_persona(psyche))
+
+
+def style_transfer_prompt(original_speech: str, psyche: Psyche) -> str:
+    """Format prompt for style transfer to reality TV dialogue
+
+    Args:
+        original_speech: The original utterance to transform
+        psyche: The agent's psyche state for context
+    """
+    return _STYLE_TRANSFER_TEMPLATE.format_map({
+        "original_speech": original_speech,
+        "name": psyche.name,
+        "interior": psyche.interior,
+        "tension_level": psyche.tension_level,
+    })
+
+
+def stress_phrase_extraction_prompt(input_message: str, existing_stressors: list = None) -> str:
+    """Format prompt for extracting stressful phrases from input message
+
+    Args:
+        input_message: The message to analyze for stressful content
+        existing_stressors: List of already known stressful phrases for context
+    """
+    existing_context = ""
+    if existing_stressors:
+        existing_context = f"Already known stressful phrases: {existing_stressors}\n\n"
+    
+    return _STRESS_PHRASE_TEMPLATE.format_map({
+        "existing_context": existing_context,
+        "input_message": input_message,
+    })
+
+
+def tension_analysis_prompt(psyche: Psyche, input_message: str, tension_before: int, tension_after: int, known_stressors: list) -> str:
+    """Format prompt for tension analysis with system summary
+
+    Args:
+        psyche: The agent's psyche state
+        input_message: The message being analyzed  
+        tension_before: Tension level before analysis
+        tension_after: Tension level after analysis
+        known_stressors: List of known stressful phrases
+    """
+    stress_patterns_detected = len([p for p in known_stressors[:5] if p in input_message.lower()])
+    
+    return _TENSION_ANALYSIS_TEMPLATE.format_map({
+        "psyche_context": _format_brief_context(psyche),
+        "input_message": input_message,
+        "known_patterns": known_stressors[:5],
+        "tension_before": tension_before,
+        "tension_after": tension_after,
+        "tension_delta": tension_after - tension_before,
+        "stress_patterns_detected": stress_patterns_detected,
+        "stressor_count": len(known_stressors),
+    })
+
+
+def emotion_generation_prompt(psyche: Psyche, utterance: str, available_emotions: list) -> str:
+    """Format prompt for generating emotion based on psyche state and utterance
+    
+    Args:
+        psyche: The agent's psyche state
+        utterance: The utterance from the other agent
+        available_emotions: List of emotions that haven't been used recently
+    """
+    return _EMOTION_TEMPLATE.format_map({
+        "psyche_context": _format_psyche_context(psyche),
+        "utterance": utterance,
+        "available_emotions": available_emotions,
+        "recent_emotions": psyche.recent_emotions[:3] or _NONE,
+    })
+
+
+def tension_interpretation_prompt(psyche: Psyche) -> str:
+    """Format prompt asking the agent to describe its current tension in a few words"""
+    return _TENSION_INTERPRETATION_TEMPLATE.format_map({
+        "persona_header": _persona_header(
+            psyche.name, psyche.personality, psyche.get_interior_summary(), psyche.get_interior_principles()
+        ),
+        "tension_level": psyche.tension_level,
+    })
 
-IMPORTANT: Respond ONLY with valid JSON containing these keys:
-- 'emotion': One of the available emotions (angry, confused, happy, intense, nervous, neutral, playful, scared, smug)
-- 'reasoning': Brief explanation of why you feel this emotion
-- 'intensity': How strongly you feel this emotion (1-10)
-- 'system_summary': Technical analysis formatted as: "EMOTION_PROCESSOR :: ANALYZED\\n{{\\n    \\"emotional_state\\": \\"[emotion]\\",\\n    \\"trigger_analysis\\": \\"[brief trigger]\\",\\n    \\"intensity_level\\": \\"[intensity]/10\\",\\n    \\"pattern_avoidance\\": \\"diversified_response\\"\\n}}"
 
-Example response: {{"emotion": "nervous", "reasoning": "Their question caught me off guard and I'm worried about giving the wrong answer", "intensity": 6, "system_summary": "EMOTION_PROCESSOR :: ANALYZED\\n{{\\n    \\"emotional_state\\": \\"nervous\\",\\n    \\"trigger_analysis\\": \\"unexpected_question\\",\\n    \\"intensity_level\\": \\"6/10\\",\\n    \\"pattern_avoidance\\": \\"diversified_response\\"\\n}}"}}"""
\ No newline at end of file
+class PromptFormatter:
+    """Class-style access to the module-level prompt builders
+
+    The builders are plain functions so internal calls skip the staticmethod
+    descriptor; this keeps the existing PromptFormatter.<name>(...) API working.
+    """
+
+    messages_to_text = staticmethod(messages_to_text)
+    bind = staticmethod(bind)
+    plan_prompt = staticmethod(plan_prompt)
+    plan_messages = staticmethod(plan_messages)
+    tactic_selection_prompt = staticmethod(tactic_selection_prompt)
+    tactic_selection_messages = staticmethod(tactic_selection_messages)
+    act_prompt = staticmethod(act_prompt)
+    act_messages = staticmethod(act_messages)
+    intent_classification_prompt = staticmethod(intent_classification_prompt)
+    intent_classification_messages = staticmethod(intent_classification_messages)
+    reflection_prompt = staticmethod(reflection_prompt)
+    reflection_messages = staticmethod(reflection_messages)
+    style_transfer_prompt = staticmethod(style_transfer_prompt)
+    stress_phrase_extraction_prompt = staticmethod(stress_phrase_extraction_prompt)
+    tension_analysis_prompt = staticmethod(tension_analysis_prompt)
+    emotion_generation_prompt = staticmethod(emotion_generation_prompt)
+    tension_interpretation_prompt = staticmethod(tension_interpretation_prompt)
+
+
+# Whether the psyche already has a plan -> builder for its planning messages
+_PLAN_DISPATCH = {
+    True: tactic_selection_messages,
+    False: _new_plan_messages,
+}
+
+
+class BoundFormatter:
+    """Prompt formatter bound to one psyche
+
+    The per-turn psyche state is rendered once and reused until the psyche
+    version changes, so only the per-turn fields are formatted on repeat calls.
+    Whole prompts are memoized the same way, keyed on their per-turn arguments.
+    """
+
+    __slots__ = ("psyche", "_ctx_version", "_ctx_head", "_memo_version", "_memo")
+
+    def __init__(self, psyche: Psyche):
+        self.psyche = psyche
+        self._ctx_version = None
+        self._ctx_head = ""
+        self._memo_version = None
+        self._memo: Dict[tuple, Any] = {}
+
+    @property
+    def turn_state(self) -> str:
+        """Rendered per-turn psyche state, rebuilt only when the psyche has changed"""
+        if self._ctx_version != self.psyche.version:
+            self._ctx_head = _format_turn_state(self.psyche)
+            self._ctx_version = self.psyche.version
+        return self._ctx_head
+
+    def _memoized(self, key: tuple, build):
+        """Return the cached prompt for key, building it if the psyche changed since"""
+        if self._memo_version != self.psyche.version:
+            self._memo.clear()
+            self._memo_version = self.psyche.version
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = build()
+            return value
+
+    def plan_prompt(self) -> str:
+        """Format the bound psyche into a planning prompt"""
+        return self._memoized(("plan",), lambda: messages_to_text(self.plan_messages()))
+
+    def plan_messages(self) -> List[Dict[str, Any]]:
+        """Format the bound psyche into planning messages"""
+        return self._memoized(("plan_messages",), lambda: plan_messages(self.psyche))
+
+    def act_prompt(self, observation: str) -> str:
+        """Format the bound psyche into an action prompt"""
+        return self._memoized(("act", observation), lambda: messages_to_text(self.act_messages(observation)))
+
+    def act_messages(self, observation: str) -> List[Dict[str, Any]]:
+        """Format the bound psyche into action messages"""
+        return self._memoized(
+            ("act_messages", observation),
+            lambda: act_messages(self.psyche, observation, turn_state=self.turn_state)
+        )
+
+    def reflection_prompt(self, input_message: str, action: ActionResult, tension_interpretation: str, conversation_summary: str = None) -> str:
+        """Format the bound psyche into a reflection prompt"""
+        return reflection_prompt(
+            self.psyche, input_message, action, tension_interpretation, conversation_summary,
+            turn_state=self.turn_state
+        )
+
+    def reflection_messages(self, input_message: str, action: ActionResult, tension_interpretation: str, conversation_summary: str = None) -> List[Dict[str, Any]]:
+        """Format the bound psyche into reflection messages"""
+        return reflection_messages(
+            self.psyche, input_message, action, tension_interpretation, conversation_summary,
+            turn_state=self.turn_state
+        )
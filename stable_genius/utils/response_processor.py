@@ -1,7 +1,19 @@
+import hashlib
 import json
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 import re
 
+from stable_genius.utils.fast_json import loads as _json_loads
+
+# Trailing comma before the closing brace, a common LLM JSON slip
+_TRAILING_COMMA_RE = re.compile(r',\s*}$')
+
+# Schema-projected results keyed by (digest of the raw response, schema fields),
+# so a repeated completion (replays, identical prompts) skips parsing
+PARSE_CACHE_SIZE = 512
+_PARSE_CACHE: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
 def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
     """Extract JSON object from text if present, with basic repair for unterminated strings."""
     try:
@@ -10,32 +22,69 @@ def extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
         if json_start >= 0 and json_end > json_start:
             json_str = text[json_start:json_end]
             try:
-                return json.loads(json_str)
+                return _json_loads(json_str)
             except json.JSONDecodeError as e:
-                # Try to repair unterminated string by truncating at the last valid quote or brace
-                # Remove any trailing incomplete string
-                # This is a best-effort fix for common LLM errors
-                # Remove any trailing comma
-                json_str = re.sub(r',\s*}$', '}', json_str)
-                # Remove any unterminated string at the end
-                last_quote = json_str.rfind('"')
-                last_brace = json_str.rfind('}')
-                if last_brace > last_quote:
-                    json_str = json_str[:last_brace+1]
-                else:
-                    json_str = json_str[:last_quote]
+                if '"' not in json_str:
+                    # The repair below can't fix string-free input
+                    return None
+                # This is a best-effort fix for common LLM errors.
+                # json_str always ends at the last '}', so no unterminated
+                # string can follow it; the one repair left is a trailing comma
+                json_str, repairs = _TRAILING_COMMA_RE.subn('}', json_str)
+                if not repairs:
+                    return None
                 try:
-                    return json.loads(json_str)
+                    return _json_loads(json_str)
                 except Exception:
                     pass
     except (json.JSONDecodeError, KeyError, IndexError, ValueError):
         pass
     return None
 
-def process_llm_response_for_json(raw_response: str, fallback_message: str = None) -> Dict[str, Any]:
-    """Process LLM response, robustly extracting JSON or returning a standard error response."""
+# Key sets of prompts whose responses are flat JSON objects
+EMOTION_SCHEMA = {"emotion": str, "reasoning": str, "intensity": int, "system_summary": str}
+
+def _apply_schema(data: Dict[str, Any], fields: tuple) -> Optional[Dict[str, Any]]:
+    """Project parsed data onto (key, type) fields, or None if it doesn't fit."""
+    result = {}
+    for key, cast in fields:
+        value = data.get(key)
+        if type(value) is not cast:
+            if value is None:
+                return None
+            try:
+                value = cast(value)
+            except (TypeError, ValueError):
+                return None
+        result[key] = value
+    return result
+
+def process_llm_response_for_json(raw_response: str, fallback_message: str = None, schema: Dict[str, type] = None) -> Dict[str, Any]:
+    """Process LLM response, robustly extracting JSON or returning a standard error response.
+
+    With a schema (key -> type) the result is narrowed to those keys with
+    coerced values; responses that don't fit it are returned as parsed.
+    Narrowed results are cached by response content.
+    """
+    if schema is not None:
+        fields = tuple(schema.items())
+        key = (hashlib.blake2b(raw_response.encode(), digest_size=16).digest(), fields)
+        cached = _PARSE_CACHE.get(key)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(key)
+            # Values are flat scalars, so a shallow copy keeps callers from sharing state
+            return dict(cached)
+
     parsed_response = extract_json_from_text(raw_response)
     if parsed_response and isinstance(parsed_response, dict):
+        if schema is not None:
+            projected = _apply_schema(parsed_response, fields)
+            if projected is None:
+                return parsed_response
+            _PARSE_CACHE[key] = projected
+            if len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+            return dict(projected)
         return parsed_response
     # If not valid JSON, return a standard error response
     return {
@@ -2,14 +2,23 @@
 Agent state management for the visualization server
 """
 import logging
+from collections import deque
 from .config import VALID_AGENT_IDS, MAX_AGENT_MESSAGES
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Blank placeholders that reserve room in the dashboard until real values arrive
+_PAD_80 = ' ' * 80
+_PAD_90 = ' ' * 90
+_PAD_100 = ' ' * 100
+_PAD_120 = ' ' * 120
+
 class AgentState:
     """Class to manage agent state and updates"""
     
+    __slots__ = ('states',)
+    
     def __init__(self):
         self.states = {
             0: self._create_default_state(),
@@ -20,13 +29,13 @@ class AgentState:
         """Create default state for an agent"""
         return {
             'name': 'Waiting for agent...',
-            'personality': ' ' * 100,
+            'personality': _PAD_100,
             'tension': 0,
-            'goal': ' ' * 120,
+            'goal': _PAD_120,
             'conversation_memory': '',
             'plan': {
-                'tactics': [' ' * 80],
-                'active_tactic': ' ' * 90
+                'tactics': [_PAD_80],
+                'active_tactic': _PAD_90
             },
             'pipeline': {
                 'components': [],
@@ -34,7 +43,7 @@ class AgentState:
             },
             'interior': {
                 'summary': '',
-                'principles': ' ' * 100
+                'principles': _PAD_100
             }
         }
     
@@ -53,87 +62,114 @@ class AgentState:
         if agent_id not in VALID_AGENT_IDS:
             return
             
-        logger.debug(f"Updating agent {agent_id} with data: {update_data}")
-            
-        # Update name, personality, tension, conversation_memory and interior if present
-        for key in ['name', 'personality', 'conversation_memory', 'interior']:
-            if key in update_data:
-                self.states[agent_id][key] = update_data[key]
-        # Handle tension logic: use numerical tension_level, not tension_interpretation
-        if 'tension_level' in update_data:
-            self.states[agent_id]['tension'] = update_data['tension_level']
-        elif 'tension' in update_data:
-            self.states[agent_id]['tension'] = update_data['tension']
+        logger.debug("Updating agent %s with data: %s", agent_id, update_data)
         
-        # Update goal if present directly in update_data (including None values)
-        if 'goal' in update_data:
-            goal_value = update_data['goal']
-            # Convert None to a more user-friendly display
-            self.states[agent_id]['goal'] = goal_value if goal_value is not None else 'No goal set'
-            logger.debug(f"Updated goal for agent {agent_id}: {update_data['goal']} -> display: {self.states[agent_id]['goal']}")
-        # Also check for goal in plan if present
-        elif 'plan' in update_data and isinstance(update_data['plan'], dict) and 'goal' in update_data['plan']:
-            goal_value = update_data['plan']['goal']
-            self.states[agent_id]['goal'] = goal_value if goal_value is not None else 'No goal set'
-            logger.debug(f"Updated goal from plan for agent {agent_id}: {update_data['plan']['goal']} -> display: {self.states[agent_id]['goal']}")
-            
-        # Handle plan updates
-        if 'plan' in update_data:
-            plan_data = update_data['plan']
-            logger.debug(f"Processing plan data for agent {agent_id}: {plan_data}")
-            
-            # Handle different plan formats
-            if isinstance(plan_data, list):
-                # If plan is a list, assume it's tactics
-                logger.debug(f"Plan is a list, treating as tactics for agent {agent_id}")
-                self.states[agent_id]['plan']['tactics'] = plan_data
-                
-                # If active_tactic isn't set and we have tactics, set the first one
-                if (self.states[agent_id]['plan'].get('active_tactic') is None and 
-                    len(plan_data) > 0):
-                    self.states[agent_id]['plan']['active_tactic'] = plan_data[0]
-                    logger.debug(f"Set first tactic as active for agent {agent_id}: {plan_data[0]}")
-            elif isinstance(plan_data, dict):
-                logger.debug(f"Plan is a dictionary for agent {agent_id}")
-                if self.states[agent_id].get('plan') is None:
-                    self.states[agent_id]['plan'] = {}
-                    
-                # Copy all plan fields
-                for key, value in plan_data.items():
-                    self.states[agent_id]['plan'][key] = value
-                    logger.debug(f"Updated plan.{key} for agent {agent_id} to: {value}")
-                    
-                # Convert tactic to tactics array if present
-                if 'tactic' in plan_data and 'tactics' not in plan_data:
-                    self.states[agent_id]['plan']['tactics'] = [plan_data['tactic']]
-                    logger.debug(f"Converted single tactic to tactics array for agent {agent_id}")
-                
-                # Check for tactics in the plan data
-                if 'tactics' in plan_data:
-                    logger.debug(f"Found tactics in plan data for agent {agent_id}: {plan_data['tactics']}")
-                    self.states[agent_id]['plan']['tactics'] = plan_data['tactics']
-                
-                # Update active_tactic if present
-                if 'active_tactic' in plan_data:
-                    self.states[agent_id]['plan']['active_tactic'] = plan_data['active_tactic']
-                    logger.debug(f"Updated active_tactic for agent {agent_id} to: {plan_data['active_tactic']}")
-                # Set first tactic as active if we have tactics but no active_tactic
-                elif ('tactics' in plan_data and plan_data['tactics'] and 
-                      'active_tactic' not in self.states[agent_id]['plan']):
-                    self.states[agent_id]['plan']['active_tactic'] = plan_data['tactics'][0]
-                    logger.debug(f"Set first tactic from tactics as active for agent {agent_id}: {plan_data['tactics'][0]}")
-            
-            # Log the final plan state
-            logger.debug(f"Final plan state for agent {agent_id}: {self.states[agent_id]['plan']}")
+        # One pass over the incoming keys; keys without a handler are ignored
+        state = self.states[agent_id]
+        for key, value in update_data.items():
+            handler = _UPDATE_HANDLERS.get(key)
+            if handler is not None:
+                handler(agent_id, state, key, value, update_data)
             
     def add_message(self, agent_id, message):
         """Add a message from an agent to its state"""
         if agent_id in VALID_AGENT_IDS and message:
-            # If the agent state doesn't already have a messages list, create one
+            # If the agent state doesn't already have a messages buffer, create one
             if 'messages' not in self.states[agent_id]:
-                self.states[agent_id]['messages'] = []
+                self.states[agent_id]['messages'] = deque(maxlen=MAX_AGENT_MESSAGES)
                 
-            # Add the message and keep only the most recent MAX_AGENT_MESSAGES
+            # Add the message; the deque keeps only the most recent MAX_AGENT_MESSAGES
             self.states[agent_id]['messages'].append(message)
-            if len(self.states[agent_id]['messages']) > MAX_AGENT_MESSAGES:
-                self.states[agent_id]['messages'] = self.states[agent_id]['messages'][-MAX_AGENT_MESSAGES:] 
\ No newline at end of file
+
+    def snapshot(self):
+        """Agent states in a JSON-serializable form (message buffers as lists)"""
+        return {
+            agent_id: {**state, 'messages': list(state['messages'])} if 'messages' in state else state
+            for agent_id, state in self.states.items()
+        }
+
+
+def _set_field(agent_id, state, key, value, update_data):
+    """Copy name, personality, conversation_memory or interior as-is"""
+    state[key] = value
+
+
+def _set_tension(agent_id, state, key, value, update_data):
+    """Use the numerical tension_level, falling back to a plain tension value"""
+    if key == 'tension_level' or 'tension_level' not in update_data:
+        state['tension'] = value
+
+
+def _set_goal(agent_id, state, key, value, update_data):
+    """Update goal (including None values)"""
+    # Convert None to a more user-friendly display
+    state['goal'] = value if value is not None else 'No goal set'
+    logger.debug("Updated goal for agent %s: %s -> display: %s", agent_id, value, state['goal'])
+
+
+def _set_plan(agent_id, state, key, plan_data, update_data):
+    """Handle plan updates, in either list (tactics) or dict form"""
+    # Also check for goal in plan if there's no goal directly in update_data
+    if 'goal' not in update_data and isinstance(plan_data, dict) and 'goal' in plan_data:
+        goal_value = plan_data['goal']
+        state['goal'] = goal_value if goal_value is not None else 'No goal set'
+        logger.debug("Updated goal from plan for agent %s: %s -> display: %s", agent_id, plan_data['goal'], state['goal'])
+    
+    logger.debug("Processing plan data for agent %s: %s", agent_id, plan_data)
+
+    # Handle different plan formats
+    if isinstance(plan_data, list):
+        # If plan is a list, assume it's tactics
+        logger.debug("Plan is a list, treating as tactics for agent %s", agent_id)
+        state['plan']['tactics'] = plan_data
+
+        # If active_tactic isn't set and we have tactics, set the first one
+        if (state['plan'].get('active_tactic') is None and 
+            len(plan_data) > 0):
+            state['plan']['active_tactic'] = plan_data[0]
+            logger.debug("Set first tactic as active for agent %s: %s", agent_id, plan_data[0])
+    elif isinstance(plan_data, dict):
+        logger.debug("Plan is a dictionary for agent %s", agent_id)
+        if state.get('plan') is None:
+            state['plan'] = {}
+
+        # Copy all plan fields
+        for plan_key, value in plan_data.items():
+            state['plan'][plan_key] = value
+            logger.debug("Updated plan.%s for agent %s to: %s", plan_key, agent_id, value)
+
+        # Convert tactic to tactics array if present
+        if 'tactic' in plan_data and 'tactics' not in plan_data:
+            state['plan']['tactics'] = [plan_data['tactic']]
+            logger.debug("Converted single tactic to tactics array for agent %s", agent_id)
+
+        # Check for tactics in the plan data
+        if 'tactics' in plan_data:
+            logger.debug("Found tactics in plan data for agent %s: %s", agent_id, plan_data['tactics'])
+            state['plan']['tactics'] = plan_data['tactics']
+
+        # Update active_tactic if present
+        if 'active_tactic' in plan_data:
+            state['plan']['active_tactic'] = plan_data['active_tactic']
+            logger.debug("Updated active_tactic for agent %s to: %s", agent_id, plan_data['active_tactic'])
+        # Set first tactic as active if we have tactics but no active_tactic
+        elif ('tactics' in plan_data and plan_data['tactics'] and 
+              'active_tactic' not in state['plan']):
+            state['plan']['active_tactic'] = plan_data['tactics'][0]
+            logger.debug("Set first tactic from tactics as active for agent %s: %s", agent_id, plan_data['tactics'][0])
+
+    # Log the final plan state
+    logger.debug("Final plan state for agent %s: %s", agent_id, state['plan'])
+
+
+# update_data key -> handler(agent_id, state, key, value, update_data)
+_UPDATE_HANDLERS = {
+    'name': _set_field,
+    'personality': _set_field,
+    'conversation_memory': _set_field,
+    'interior': _set_field,
+    'tension_level': _set_tension,
+    'tension': _set_tension,
+    'goal': _set_goal,
+    'plan': _set_plan,
+}
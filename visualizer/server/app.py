@@ -4,23 +4,28 @@ Main Flask application for the visualization server
 import signal
 import sys
 import argparse
-from flask import Flask
-from flask_socketio import SocketIO
 from pathlib import Path
 
 from .config import (
     CONFIG_DIR, TEMPLATE_DIR, DEFAULT_PORT, DEFAULT_API_URL,
-    load_config
+    load_config, async_mode
 )
-from .agent_state import AgentState
-from .conversation_manager import ConversationHistory, ConversationManager
-from .handlers import Handlers
+from .json_codec import SOCKETIO_JSON
 from stable_genius.utils.logger import logger
 
 class VisualizerApp:
     """Main visualizer application class"""
     
     def __init__(self):
+        # Flask, Socket.IO and the handlers (which pull in requests) are only
+        # imported once an app is built, so `--help` starts instantly
+        from flask import Flask
+        from flask_socketio import SocketIO
+        from .agent_state import AgentState
+        from .conversation_manager import ConversationHistory, ConversationManager
+        from .handlers import Handlers
+        from .json_provider import JSON_PROVIDER
+        
         # Create directories if they don't exist
         CONFIG_DIR.mkdir(exist_ok=True)
         TEMPLATE_DIR.mkdir(exist_ok=True)
@@ -31,7 +36,8 @@ class VisualizerApp:
             static_folder=str(TEMPLATE_DIR / "static"),
             static_url_path='/static'
         )
-        self.socketio = SocketIO(self.app, async_mode='threading')
+        self.app.json = JSON_PROVIDER(self.app)
+        self.socketio = SocketIO(self.app, async_mode=async_mode(), json=SOCKETIO_JSON)
         
         # Initialize state managers
         self.agent_state = AgentState()
@@ -56,7 +62,7 @@ class VisualizerApp:
         while True:
             api_url = self.app.config.get('API_URL', DEFAULT_API_URL)
             self.conversation.check_status(api_url)
-            self.socketio.sleep(2)
+            self.socketio.sleep(self.conversation.poll_interval)
     
     def run(self, port=DEFAULT_PORT, api_url=DEFAULT_API_URL, auto_start=True):
         """Run the Flask server"""
@@ -64,6 +70,7 @@ class VisualizerApp:
         self.app.config['PORT'] = port
         self.app.config['API_URL'] = api_url
         self.app.config['AUTO_START'] = auto_start
+        self.handlers.bind_config(port, api_url, auto_start)
         
         # Start background task to poll conversation status
         self.socketio.start_background_task(self.poll_conversation_status)
@@ -79,6 +86,15 @@ def signal_handler(sig, frame):
 
 
 def main():
+    # eventlet has to patch the stdlib before Flask and the handlers import
+    # socket/threading; they are only imported once VisualizerApp is built
+    try:
+        import eventlet
+    except ImportError:  # eventlet is optional; without it each connection gets a thread
+        pass
+    else:
+        eventlet.monkey_patch()
+
     # Set up signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     
@@ -1,9 +1,12 @@
 """
 Configuration management for the visualization server
 """
-import json
+import sys
+from functools import lru_cache
 from pathlib import Path
 
+from stable_genius.utils.fast_json import loads as json_loads
+
 # Constants
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
@@ -13,14 +16,32 @@ DEFAULT_API_URL = "http://localhost:8000"
 DEFAULT_PORT = 5000
 MAX_HISTORY_ITEMS = 3
 MAX_AGENT_MESSAGES = 10
-VALID_AGENT_IDS = [0, 1]
+POLL_INTERVAL_MIN = 2  # Seconds between conversation status polls
+POLL_INTERVAL_MAX = 30  # Ceiling for the idle poll backoff
+POLL_BACKOFF = 1.5  # Growth factor for the poll interval while nothing changes
+VALID_AGENT_IDS = frozenset({0, 1})
+
+def async_mode():
+    """Socket.IO async mode matching how the entry point set up the process
 
+    Cooperative greenlets when the entry point monkey-patched the stdlib with
+    eventlet, a thread per connection otherwise.
+    """
+    eventlet = sys.modules.get("eventlet")
+    if eventlet is not None and eventlet.patcher.is_monkey_patched("socket"):
+        return "eventlet"
+    return "threading"
+
+@lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from generated JSON file"""
+    """Load configuration from generated JSON file
+
+    The parsed config is cached for the life of the process; call
+    load_config.cache_clear() to pick up a regenerated file.
+    """
     if not CONFIG_FILE.exists():
         raise FileNotFoundError(f"Config file not found: {CONFIG_FILE}. Please run the main app to generate this file before starting the visualizer.")
     try:
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(CONFIG_FILE.read_bytes())
     except Exception as e:
         raise Exception(f"Error loading config file: {e}") 
\ No newline at end of file
@@ -1,38 +1,45 @@
 """
 Conversation management for the visualization server
 """
+from collections import deque
 import requests
-from .config import MAX_HISTORY_ITEMS, DEFAULT_API_URL
+from requests.adapters import HTTPAdapter
+from .config import (
+    MAX_HISTORY_ITEMS, DEFAULT_API_URL,
+    POLL_INTERVAL_MIN, POLL_INTERVAL_MAX, POLL_BACKOFF
+)
 from stable_genius.utils.logger import logger
 import time
 
 class ConversationHistory:
     """Class to manage conversation history"""
     
+    __slots__ = ('history', 'messages', '_non_system')
+    
     def __init__(self):
+        # Newest first, capped at MAX_HISTORY_ITEMS
         self.history = {
-            'prompts': [],
-            'responses': [],
-            'titles': [],
-            'times': []
+            'prompts': deque(maxlen=MAX_HISTORY_ITEMS),
+            'responses': deque(maxlen=MAX_HISTORY_ITEMS),
+            'titles': deque(maxlen=MAX_HISTORY_ITEMS),
+            'times': deque(maxlen=MAX_HISTORY_ITEMS)
         }
-        # Storage for conversation messages
-        self.messages = []
+        # Storage for conversation messages (most recent 100)
+        self.messages = deque(maxlen=100)
+        # Non-System messages within self.messages, kept in step for client restores
+        self._non_system = deque()
     
     def add_interaction(self, prompt, response, title, elapsed_time):
         """Add a new interaction to history"""
-        self.history['prompts'].insert(0, prompt)
-        self.history['responses'].insert(0, response)
-        self.history['titles'].insert(0, title)
-        self.history['times'].insert(0, elapsed_time)
-        
-        # Trim history to maximum size
-        for key in self.history:
-            self.history[key] = self.history[key][:MAX_HISTORY_ITEMS]
+        # appendleft drops the oldest entry once the deque is full
+        self.history['prompts'].appendleft(prompt)
+        self.history['responses'].appendleft(response)
+        self.history['titles'].appendleft(title)
+        self.history['times'].appendleft(elapsed_time)
     
     def get_history(self):
-        """Get current history"""
-        return self.history
+        """Get current history (as lists, ready to serialize)"""
+        return {key: list(items) for key, items in self.history.items()}
         
     def add_message(self, sender, message, sender_id=None, emotion=None, original_speech=None):
         """Add a message to the conversation history"""
@@ -49,19 +56,27 @@ class ConversationHistory:
         if original_speech:
             message_data['original_speech'] = original_speech
             
-        self.messages.append(message_data)
+        # The oldest message is about to be dropped; drop it from the view too
+        if len(self.messages) == self.messages.maxlen and self.messages[0]['sender'] != 'System':
+            self._non_system.popleft()
         
-        # Keep only the most recent 100 messages
-        if len(self.messages) > 100:
-            self.messages = self.messages[-100:]
+        self.messages.append(message_data)
+        if sender != 'System':
+            self._non_system.append(message_data)
     
     def get_messages(self):
         """Get all conversation messages"""
-        return self.messages
+        return list(self.messages)
+    
+    def get_non_system_messages(self):
+        """Get conversation messages excluding System messages"""
+        return list(self._non_system)
 
 class ConversationManager:
     """Class to manage conversations with the API server"""
     
+    __slots__ = ('socketio', 'active', 'conversation_id', 'api_url', 'auto_restart', 'port', 'poll_interval', '_session', '_last_status')
+    
     def __init__(self, socketio):
         self.socketio = socketio
         self.active = False
@@ -69,6 +84,14 @@ class ConversationManager:
         self.api_url = DEFAULT_API_URL
         self.auto_restart = True
         self.port = None
+        # Keep-alive connection pool for the 2-second status polling
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        self._session.headers['Connection'] = 'keep-alive'
+        # Last polled status sent to clients, so unchanged polls aren't re-emitted
+        self._last_status = None
+        # Seconds until the next status poll; grows while an idle status repeats
+        self.poll_interval = POLL_INTERVAL_MIN
     
     def set_api_url(self, url):
         """Set the API URL"""
@@ -94,7 +117,7 @@ class ConversationManager:
             vis_url = f"http://localhost:{port}/api/update"
             
             # Call the conversation API server
-            response = requests.post(
+            response = self._session.post(
                 f"{api_url}/api/start-conversation",
                 json={'visualizer_url': vis_url},
                 timeout=10
@@ -104,6 +127,7 @@ class ConversationManager:
                 data = response.json()
                 self.active = True
                 self.conversation_id = data.get('conversation_id')
+                self.poll_interval = POLL_INTERVAL_MIN
                 logger.info(f"Started conversation with ID: {self.conversation_id}")
                 self._emit_system_message(f'Started conversation with ID: {self.conversation_id}')
                 self._emit_status('started')
@@ -124,7 +148,7 @@ class ConversationManager:
             return
         
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{api_url}/api/conversation-status/{self.conversation_id}",
                 timeout=5
             )
@@ -134,11 +158,12 @@ class ConversationManager:
                 status = data.get('status')
                 
                 # Send status update to client
-                self.socketio.emit('conversation_status', {
+                changed = self._emit_polled_status({
                     'active': status == 'running',
                     'conversation_id': self.conversation_id,
                     'status': status
                 })
+                self._adjust_poll_interval(changed, status == 'running')
                 
                 if status in ['completed', 'error']:
                     logger.info(f'Conversation {self.conversation_id} {status}')
@@ -168,15 +193,34 @@ class ConversationManager:
                 self.conversation_id = None
                 
                 # Send status update to client
-                self.socketio.emit('conversation_status', {
+                changed = self._emit_polled_status({
                     'active': False,
                     'conversation_id': None,
                     'status': 'not_found'
                 })
+                self._adjust_poll_interval(changed, False)
         except requests.RequestException:
             # Ignore connection errors during status checks
             pass
     
+    def _emit_polled_status(self, payload):
+        """Emit a polled conversation status, skipping polls where nothing changed
+        
+        Returns True if the status changed and was emitted.
+        """
+        if payload == self._last_status:
+            return False
+        self._last_status = payload
+        self.socketio.emit('conversation_status', payload)
+        return True
+    
+    def _adjust_poll_interval(self, changed, running):
+        """Back off polling while an idle status repeats; poll quickly on any change"""
+        if changed or running:
+            self.poll_interval = POLL_INTERVAL_MIN
+        else:
+            self.poll_interval = min(self.poll_interval * POLL_BACKOFF, POLL_INTERVAL_MAX)
+    
     def _emit_system_message(self, message):
         """Emit a system message"""
         self.socketio.emit('add_message', {
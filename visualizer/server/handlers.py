@@ -1,12 +1,20 @@
 """
 Event and route handlers for the visualization server
 """
-from flask import request, jsonify, render_template
-import requests
+from flask import Response, request, jsonify, render_template
+import queue
+import threading
 import time
 from .config import VALID_AGENT_IDS
 from stable_genius.utils.logger import logger
 
+FORWARD_QUEUE_SIZE = 1024  # Events waiting to be forwarded to the history server
+FORWARD_BATCH_SIZE = 64  # Max events handed to the history server at once
+FORWARD_BATCH_WINDOW = 0.005  # Seconds to wait for more events before sending a batch
+PAGE_TEMPLATES = ('index.html', 'conversation.html', 'agent_1.html', 'agent_2.html')
+# Pages are rendered once, so browsers revalidate rather than cache them outright
+PAGE_HEADERS = {'Cache-Control': 'no-cache'}
+
 class Handlers:
     """Class to manage event and route handlers"""
     
@@ -17,11 +25,65 @@ class Handlers:
         self.history = history
         self.conversation = conversation
         
+        # Server settings, snapshotted by bind_config() once the app is configured
+        self._port = None
+        self._api_url = None
+        self._auto_start = False
+        # In-process history server, set by bind_history_sink(); events are only
+        # forwarded when one is bound
+        self._history_sink = None
+        
+        # Last agent_update received per agent, to drop repeated snapshots
+        self._last_agent_update = {}
+        
+        # Connected Socket.IO clients; broadcasts are skipped while nobody listens.
+        # Connect and disconnect handlers run concurrently, so updates take the lock
+        self._clients = 0
+        self._clients_lock = threading.Lock()
+        
+        # Events for the history server are delivered by a background worker so
+        # /api/update can return without waiting on its broadcasts
+        self._forward_queue = queue.Queue(maxsize=FORWARD_QUEUE_SIZE)
+        self.socketio.start_background_task(self._forward_worker)
+        
+        # Client broadcasts for /api/update are sent by a single background
+        # worker, so the API server is not held up and event order is kept
+        self._emit_queue = queue.Queue()
+        self.socketio.start_background_task(self._emit_worker)
+        
+        # Event type -> handler for updates posted to /api/update
+        self._dispatch = {
+            'config': self._handle_config,
+            'initialize_agents': self._handle_initialize_agents,
+            'llm_interaction': self._handle_llm_interaction,
+            'add_message': self._handle_message,  # Reuse message handler for add_message events
+            'agent_update': self._handle_agent_update,
+            'pipeline_update': self._handle_pipeline_update,
+        }
+        
+        # The page templates have no variables, so render them once up front
+        with app.app_context():
+            self._pages = {name: render_template(name) for name in PAGE_TEMPLATES}
+        
         # Set up routes
         self._setup_routes()
         # Set up socketio handlers
         self._setup_socketio_handlers()
     
+    def bind_config(self, port, api_url, auto_start):
+        """Store the server settings read on per-event paths"""
+        self._port = port
+        self._api_url = api_url
+        self._auto_start = auto_start
+    
+    def bind_history_sink(self, sink):
+        """Hand forwarded event batches to sink(batch), the in-process history server"""
+        self._history_sink = sink
+    
+    def _forwarding(self):
+        """Whether events should be forwarded to a history server"""
+        return self._history_sink is not None
+    
     def _setup_routes(self):
         """Set up Flask routes"""
         self.app.route('/')(self.index)
@@ -33,46 +95,54 @@ class Handlers:
     def _setup_socketio_handlers(self):
         """Set up Socket.IO event handlers"""
         self.socketio.on('connect')(self.handle_connect)
+        self.socketio.on('disconnect')(self.handle_disconnect)
         self.socketio.on('start_conversation')(self.handle_start_conversation)
         self.socketio.on('request_autostart')(self.handle_autostart_request)
     
+    def _page(self, name):
+        """Serve a pre-rendered page"""
+        return Response(self._pages[name], mimetype='text/html', headers=PAGE_HEADERS)
+    
     def index(self):
         """Handle root route"""
-        return render_template('index.html')
+        return self._page('index.html')
     
     def conversation_page(self):
         """Handle conversation route"""
-        return render_template('conversation.html')
+        return self._page('conversation.html')
     
     def agent_1_page(self):
         """Handle agent 1 image page"""
-        return render_template('agent_1.html')
+        return self._page('agent_1.html')
 
     def agent_2_page(self):
         """Handle agent 2 image page"""
-        return render_template('agent_2.html')
+        return self._page('agent_2.html')
     
     def receive_update(self):
         """Receive updates from the conversation API server"""
-        update_data = request.json
-        event_type = update_data.get('event_type')
-        if event_type == 'config':
-            self.socketio.emit('config', update_data.get('config', {}))
-        elif event_type == 'initialize_agents':
-            self._handle_initialize_agents(update_data)
-        elif event_type == 'llm_interaction':
-            self._handle_llm_interaction(update_data)
-        # elif event_type == 'message':
-        #     self._handle_message(update_data)
-        elif event_type == 'add_message':
-            self._handle_message(update_data)  # Reuse message handler for add_message events
-        elif event_type == 'agent_update':
-            self._handle_agent_update(update_data)
-        elif event_type == 'pipeline_update':
-            self._handle_pipeline_update(update_data)
+        update_data = request.get_json(cache=False)
+        handler = self._dispatch.get(update_data.get('event_type'))
+        if handler:
+            handler(update_data)
         
         return jsonify({'status': 'success'})
     
+    def _emit(self, event, data):
+        """Queue a broadcast to connected clients (dropped when none are connected)"""
+        if self._clients:
+            self._emit_queue.put((event, data))
+    
+    def _emit_worker(self):
+        """Background task broadcasting queued events in arrival order"""
+        while True:
+            event, data = self._emit_queue.get()
+            self.socketio.emit(event, data)
+    
+    def _handle_config(self, update_data):
+        """Handle configuration event"""
+        self._emit('config', update_data.get('config', {}))
+    
     def _handle_initialize_agents(self, update_data):
         """Handle agent initialization event"""
         agents = update_data.get('agents', [])
@@ -84,11 +154,12 @@ class Handlers:
             
             # Update agent info like goal, personality, etc.
             self.agent_state.update_agent_info(agent_id, agent)
+        
+        # State may have changed, so the next agent_update must be applied
+        self._last_agent_update.clear()
                 
         # Send initialization data for agents
-        self.socketio.emit('initialize_agents', {
-            'agents': update_data.get('agents', [])
-        })
+        self._emit('initialize_agents', {'agents': agents})
     
     def _handle_llm_interaction(self, update_data):
         """Handle LLM interaction event"""
@@ -99,54 +170,66 @@ class Handlers:
         elapsed_time = update_data.get('elapsed_time', '--')
         
         # Log the data we received for debugging
-        logger.debug(f"LLM interaction received - Title: {step_title}")
-        logger.debug(f"Prompt length: {len(prompt)}, Response length: {len(response)}")
+        logger.debug("LLM interaction received - Title: %s", step_title)
+        logger.debug("Prompt length: %d, Response length: %d", len(prompt), len(response))
         
         # Store in history
         self.history.add_interaction(prompt, response, step_title, elapsed_time)
         
-        # Format elapsed time
-        formatted_time = f"{elapsed_time}s" if elapsed_time not in [None, '--'] else '--'
-        
-        # Ensure we're explicitly including the prompt and response in the emit
-        event_data = {
-            'prompt': prompt,
-            'response': response,
-            'elapsed_time': formatted_time,
-            'step_title': step_title
-        }
-        
-        # Emit the event with the complete data
-        self.socketio.emit('llm_interaction', event_data)
+        # Emit the event with the complete data (only formatted if a client will receive it)
+        if self._clients:
+            self._emit('llm_interaction', {
+                'prompt': prompt,
+                'response': response,
+                'elapsed_time': f"{elapsed_time}s" if elapsed_time not in (None, '--') else '--',
+                'step_title': step_title
+            })
         
         # Forward to history server if configured
         self._forward_to_history_server(update_data)
     
     def _forward_to_history_server(self, update_data):
         """Forward LLM interactions to the history server"""
-        history_server_url = self.app.config.get('HISTORY_SERVER_URL')
-        if history_server_url:
+        if self._forwarding():
+            # Ensure we have a properly formatted event type
+            forwarded_data = {
+                'event_type': 'llm_interaction',
+                'prompt': update_data.get('prompt', ''),
+                'response': update_data.get('response', ''),
+                'step_title': update_data.get('step_title', ''),
+                'elapsed_time': update_data.get('elapsed_time', '--'),
+                'timestamp': update_data.get('timestamp', time.time())
+            }
+            
+            # Log what we're forwarding for debugging
+            logger.debug("Forwarding LLM interaction to history server: %s", forwarded_data['step_title'])
+            
+            self._enqueue_forward(forwarded_data)
+    
+    def _enqueue_forward(self, forwarded_data):
+        """Queue an event for the history server worker"""
+        try:
+            self._forward_queue.put_nowait(forwarded_data)
+        except queue.Full:
+            logger.debug("History server forward queue is full, dropping event")
+    
+    def _forward_worker(self):
+        """Background task delivering queued events to the history server in batches"""
+        while True:
+            batch = [self._forward_queue.get()]
+            # Give events arriving in a burst a moment to join this batch
+            self.socketio.sleep(FORWARD_BATCH_WINDOW)
+            while len(batch) < FORWARD_BATCH_SIZE:
+                try:
+                    batch.append(self._forward_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # One bad batch must not end the only forward worker
             try:
-                # Ensure we have a properly formatted event type
-                forwarded_data = {
-                    'event_type': 'llm_interaction',
-                    'prompt': update_data.get('prompt', ''),
-                    'response': update_data.get('response', ''),
-                    'step_title': update_data.get('step_title', ''),
-                    'elapsed_time': update_data.get('elapsed_time', '--'),
-                    'timestamp': update_data.get('timestamp', time.time())
-                }
-                
-                # Log what we're forwarding for debugging
-                logger.debug(f"Forwarding LLM interaction to history server: {forwarded_data['step_title']}")
-                
-                requests.post(
-                    f"{history_server_url}/api/update",
-                    json=forwarded_data,
-                    timeout=1
-                )
-            except requests.RequestException as e:
-                logger.debug(f"Error forwarding to history server: {e}")
+                self._history_sink(batch)
+            except Exception as e:
+                logger.debug("Error forwarding to history server: %s", e)
     
     def _handle_message(self, update_data):
         """Handle message event"""
@@ -177,78 +260,69 @@ class Handlers:
             if original_speech:
                 emit_data['original_speech'] = original_speech
                 
-            self.socketio.emit('add_message', emit_data)
+            self._emit('add_message', emit_data)
         
         # Forward to history server
-        history_server_url = self.app.config.get('HISTORY_SERVER_URL')
-        if history_server_url:
-            try:
-                forwarded_data = {
-                    'event_type': 'add_message',
-                    'sender': sender,
-                    'sender_id': sender_id,
-                    'message': message,
-                    'timestamp': time.time()
-                }
-                
-                # Add emotion and original speech if present
-                if emotion:
-                    forwarded_data['emotion'] = emotion
-                if original_speech:
-                    forwarded_data['original_speech'] = original_speech
-                
-                logger.debug(f"Forwarding message to history server: {sender}: {message[:50]}...")
-                
-                requests.post(
-                    f"{history_server_url}/api/update",
-                    json=forwarded_data,
-                    timeout=1
-                )
-            except requests.RequestException as e:
-                logger.debug(f"Error forwarding message to history server: {e}")
+        if self._forwarding():
+            forwarded_data = {
+                'event_type': 'add_message',
+                'sender': sender,
+                'sender_id': sender_id,
+                'message': message,
+                'timestamp': time.time()
+            }
+            
+            # Add emotion and original speech if present
+            if emotion:
+                forwarded_data['emotion'] = emotion
+            if original_speech:
+                forwarded_data['original_speech'] = original_speech
+            
+            logger.debug("Forwarding message to history server: %s: %.50s...", sender, message)
+            
+            self._enqueue_forward(forwarded_data)
     
     def _handle_agent_update(self, update_data):
         """Handle agent update event"""
         agent_id = update_data.get('agent_id', 0)
+        if agent_id not in VALID_AGENT_IDS:
+            return
         
-        logger.debug(f"Handling agent_update for agent {agent_id}")
-        logger.debug(f"Received update data: {update_data}")
+        # The conversation server re-sends full agent snapshots; an identical
+        # one would leave the state as it is, so skip the update and broadcast
+        if update_data == self._last_agent_update.get(agent_id):
+            logger.debug("Skipping unchanged agent_update for agent %s", agent_id)
+            return
+        self._last_agent_update[agent_id] = update_data
+        
+        logger.debug("Handling agent_update for agent %s", agent_id)
+        logger.debug("Received update data: %s", update_data)
         
         # Update agent info with new data
         self.agent_state.update_agent_info(agent_id, update_data)
                 
-        # Get the updated state after processing
-        updated_state = self.agent_state.states.get(agent_id, {})
-        
-        # Get goal from the updated agent state (already processed by update_agent_info)
-        goal = updated_state.get('goal', 'No goal set')
-        logger.debug(f"Using processed goal from agent state: {goal}")
+        # Get the updated state after processing; name, personality, interior,
+        # goal and tension all come from it
+        state = self.agent_state.states[agent_id]
         
         # Get plan from update data or use cached plan
-        plan = update_data.get('plan', updated_state.get('plan', {}))
-        logger.debug(f"Using plan: {plan}")
-        
-        # Log plan details specifically
-        if isinstance(plan, dict):
-            logger.debug(f"Plan tactics: {plan.get('tactics')}")
-            logger.debug(f"Plan active tactic: {plan.get('active_tactic')}")
-        
-        # Get interior from update data or use cached interior
-        interior = update_data.get('interior', updated_state.get('interior', {}))
+        plan = update_data.get('plan', state['plan'])
+        logger.debug("Using plan: %s", plan)
         
         # Build the payload to emit
         payload = {
-            'name': update_data.get('name', updated_state.get('name', '')),
-            'personality': update_data.get('personality', updated_state.get('personality', '')),
-            'tension': updated_state.get('tension', 0),  # Use processed tension from updated_state
-            'goal': goal,
+            'name': state['name'],
+            'personality': state['personality'],
+            'tension': state['tension'],
+            'goal': state['goal'],
             'plan': plan,
-            'interior': interior
+            'interior': state['interior']
         }
-        logger.debug(f"Emitting update_agent{agent_id+1} with payload: {payload}")
+        logger.debug("Queueing update for agent %s with payload: %s", agent_id, payload)
         
-        # Fixed emit to match what client is expecting
-        self.socketio.emit(f'update_agent{agent_id+1}', payload)
+        # Goes through the emit queue like every other broadcast, so it stays
+        # in order with the messages and pipeline updates around it
+        self._emit('update_agents', {agent_id: payload})
     
     def _handle_pipeline_update(self, update_data):
         """Handle pipeline update event"""
@@ -265,7 +339,7 @@ class Handlers:
             self.agent_state.update_pipeline_stage(agent_id, update_data['stage'])
         
             
-        self.socketio.emit('pipeline_update', {
+        self._emit('pipeline_update', {
             'agent_id': agent_id,
             'agent_name': update_data.get('agent_name', ''),
             'stage': update_data.get('stage', ''),
@@ -275,16 +349,14 @@ class Handlers:
     def handle_connect(self):
         """Handle client connection"""
         logger.info('Client connected')
-        
-        # Get messages and filter out system messages
-        all_messages = self.history.get_messages()
-        filtered_messages = [msg for msg in all_messages if msg.get('sender') != 'System']
+        with self._clients_lock:
+            self._clients += 1
         
         # Send current state to the client
         self.socketio.emit('restore_state', {
-            'agent_states': self.agent_state.states,
+            'agent_states': self.agent_state.snapshot(),
             'conversation_history': self.history.get_history(),
-            'messages': filtered_messages
+            'messages': self.history.get_non_system_messages()
         })
         
         # Send current conversation status
@@ -294,21 +366,22 @@ class Handlers:
             'status': 'active' if self.conversation.active else 'waiting'
         })
     
+    def handle_disconnect(self):
+        """Handle client disconnection"""
+        with self._clients_lock:
+            self._clients = max(self._clients - 1, 0)
+    
     def handle_start_conversation(self):
         """Handle start conversation event from client"""
         logger.info("Received start_conversation event from client")
-        api_url = self.app.config.get('API_URL')
-        port = self.app.config.get('PORT')
-        self.conversation.start_conversation(api_url, port)
+        self.conversation.start_conversation(self._api_url, self._port)
     
     def handle_autostart_request(self):
         """Handle autostart request from client"""
         # Check if auto-start is enabled
-        if self.app.config.get('AUTO_START', False) and not self.conversation.active:
+        if self._auto_start and not self.conversation.active:
             logger.info("Auto-starting conversation per client request")
-            api_url = self.app.config.get('API_URL')
-            port = self.app.config.get('PORT')
-            self.conversation.start_conversation(api_url, port)
+            self.conversation.start_conversation(self._api_url, self._port)
         else:
             # Notify client of current conversation status
             self.socketio.emit('conversation_status', {
@@ -0,0 +1,23 @@
+"""
+JSON codec for Socket.IO packets
+"""
+import json
+
+from stable_genius.utils.fast_json import orjson
+
+
+class OrjsonCodec:
+    """Drop-in for the json module backed by orjson, for SocketIO(json=...)"""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # orjson output is always compact, so json.dumps options like separators don't apply
+        return orjson.dumps(obj, default=list, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+# Serializer handed to every SocketIO instance
+SOCKETIO_JSON = OrjsonCodec if orjson is not None else json
@@ -0,0 +1,21 @@
+"""
+Flask JSON provider for the visualization servers
+"""
+from flask.json.provider import DefaultJSONProvider
+
+from stable_genius.utils.fast_json import orjson
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, for jsonify() and request.json"""
+
+    def dumps(self, obj, **kwargs):
+        # orjson output is always compact, so json.dumps options like sort_keys don't apply
+        return orjson.dumps(obj, default=list, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# Provider assigned to app.json on every Flask app
+JSON_PROVIDER = OrjsonProvider if orjson is not None else DefaultJSONProvider
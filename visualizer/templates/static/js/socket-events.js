@@ -163,35 +163,22 @@ function initializeSocketEvents(io) {
         ChatManager.addMessage('System', message);
     });
 
-    // Listen for agent updates
-    socket.on('update_agent1', (data) => {
-        Logger.log('Received update_agent1 event with data:', data);
+    // Listen for agent updates (payloads keyed by agent id)
+    socket.on('update_agents', (updates) => {
+        Logger.log('Received update_agents event with data:', updates);
         
-        // Log plan data specifically
-        if (data.plan) {
-            Logger.log('Plan data for agent 1:', data.plan);
-            Logger.log('Plan tactics for agent 1:', data.plan.tactics);
-            Logger.log('Plan active tactic for agent 1:', data.plan.active_tactic);
-        } else {
-            Logger.log('No plan data in update_agent1 event');
-        }
-        
-        AgentManager.updateAgentInfo(0, data);
-    });
-
-    socket.on('update_agent2', (data) => {
-        Logger.log('Received update_agent2 event with data:', data);
-        
-        // Log plan data specifically
-        if (data.plan) {
-            Logger.log('Plan data for agent 2:', data.plan);
-            Logger.log('Plan tactics for agent 2:', data.plan.tactics);
-            Logger.log('Plan active tactic for agent 2:', data.plan.active_tactic);
-        } else {
-            Logger.log('No plan data in update_agent2 event');
-        }
-        
-        AgentManager.updateAgentInfo(1, data);
+        Object.entries(updates).forEach(([agentId, data]) => {
+            // Log plan data specifically
+            if (data.plan) {
+                Logger.log(`Plan data for agent ${Number(agentId) + 1}:`, data.plan);
+                Logger.log(`Plan tactics for agent ${Number(agentId) + 1}:`, data.plan.tactics);
+                Logger.log(`Plan active tactic for agent ${Number(agentId) + 1}:`, data.plan.active_tactic);
+            } else {
+                Logger.log(`No plan data in update for agent ${Number(agentId) + 1}`);
+            }
+            
+            AgentManager.updateAgentInfo(Number(agentId), data);
+        });
     });
 
     socket.on('pipeline_update', (data) => {  
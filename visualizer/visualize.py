@@ -3,15 +3,25 @@
 Combined visualization dashboard for agent conversations with real-time updates.
 Runs both the main agent visualization server and the history server.
 """
+if __name__ == "__main__":
+    # eventlet has to patch the stdlib before anything else imports socket/threading,
+    # so only the script entry point does it; importing this module never patches
+    try:
+        import eventlet
+    except ImportError:  # eventlet is optional; without it each connection gets a thread
+        pass
+    else:
+        eventlet.monkey_patch()
+
 import sys
 import signal
 import argparse
 import threading
 import time
 import logging
-import requests
+from collections import deque
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO
 
 # Add project root to path for imports
@@ -20,11 +30,13 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from visualizer.server.config import (
     CONFIG_DIR, TEMPLATE_DIR, DEFAULT_PORT, DEFAULT_API_URL, 
-    load_config
+    load_config, async_mode
 )
 from visualizer.server.agent_state import AgentState
 from visualizer.server.conversation_manager import ConversationHistory, ConversationManager
-from visualizer.server.handlers import Handlers
+from visualizer.server.handlers import Handlers, PAGE_HEADERS
+from visualizer.server.json_codec import SOCKETIO_JSON
+from visualizer.server.json_provider import JSON_PROVIDER
 from stable_genius.utils.logger import logger
 
 # Default port for history server
@@ -32,13 +44,11 @@ HISTORY_PORT = 5001
 
 # Global flag for shutdown
 shutdown_requested = False
-# Global reference to history server URL for forwarding events
-history_server_url = None
 
 class MainVisualizerApp:
     """Main visualizer application class"""
     
-    def __init__(self, auto_restart=True):
+    def __init__(self, auto_restart=True, history_app=None):
         # Create directories if they don't exist
         CONFIG_DIR.mkdir(exist_ok=True)
         TEMPLATE_DIR.mkdir(exist_ok=True)
@@ -49,7 +59,8 @@ class MainVisualizerApp:
             static_folder=str(TEMPLATE_DIR / "static"),
             static_url_path='/static'
         )
-        self.socketio = SocketIO(self.app, async_mode='threading')
+        self.app.json = JSON_PROVIDER(self.app)
+        self.socketio = SocketIO(self.app, async_mode=async_mode(), json=SOCKETIO_JSON)
         
         # Initialize state managers
         self.agent_state = AgentState()
@@ -72,15 +83,17 @@ class MainVisualizerApp:
             self.conversation
         )
         
-        # Set global history server URL
-        self.app.config['HISTORY_SERVER_URL'] = history_server_url
+        # LLM interactions and messages are forwarded only to a history server
+        # running in this process, by direct call
+        if history_app is not None:
+            self.handlers.bind_history_sink(history_app.ingest_batch)
     
     def poll_conversation_status(self):
         """Background task to poll the conversation status"""
         while not shutdown_requested:
             api_url = self.app.config.get('API_URL', DEFAULT_API_URL)
             self.conversation.check_status(api_url)
-            self.socketio.sleep(2)
+            self.socketio.sleep(self.conversation.poll_interval)
     
     def run(self, port=DEFAULT_PORT, api_url=DEFAULT_API_URL, auto_start=True):
         """Run the Flask server"""
@@ -88,6 +101,7 @@ class MainVisualizerApp:
         self.app.config['PORT'] = port
         self.app.config['API_URL'] = api_url
         self.app.config['AUTO_START'] = auto_start
+        self.handlers.bind_config(port, api_url, auto_start)
         
         # Disable Werkzeug access logs
         log = logging.getLogger('werkzeug')
@@ -110,10 +124,15 @@ class HistoryVisualizerApp:
             static_folder=str(TEMPLATE_DIR / "static"),
             static_url_path='/static'
         )
-        self.socketio = SocketIO(self.app, async_mode='threading')
+        self.app.json = JSON_PROVIDER(self.app)
+        self.socketio = SocketIO(self.app, async_mode=async_mode(), json=SOCKETIO_JSON)
         
-        # Initialize history storage
-        self.history_items = []
+        # Initialize history storage (most recent 100 items)
+        self.history_items = deque(maxlen=100)
+        
+        # The history page has no template variables, so render it once up front
+        with self.app.app_context():
+            self._history_html = render_template('history.html')
         
         # Set up routes
         self._setup_routes()
@@ -122,52 +141,55 @@ class HistoryVisualizerApp:
         """Set up Flask routes"""
         @self.app.route('/')
         def index():
-            return render_template('history.html')
+            return Response(self._history_html, mimetype='text/html', headers=PAGE_HEADERS)
             
         @self.app.route('/api/update', methods=['POST'])
         def receive_update():
             """Receive updates from the conversation API server"""
             # Forward all events to clients
-            update_data = request.json
-            event_type = update_data.get('event_type')
-            
-            # Store LLM interactions for history
-            if event_type == 'llm_interaction':
-                # Store with timestamp
-                if 'timestamp' not in update_data:
-                    update_data['timestamp'] = time.time()
-                
-                # Add to history
-                self.history_items.append(update_data)
-                
-                # Only keep the most recent 100 items
-                if len(self.history_items) > 100:
-                    self.history_items = self.history_items[-100:]
-                
-                # Debug logging
-                logger.debug(f"History server received interaction: {update_data.get('step_title', '--')}")
-                logger.debug(f"Prompt length: {len(update_data.get('prompt', ''))}, Response length: {len(update_data.get('response', ''))}")
-            
-            # Store agent messages in history too
-            elif event_type == 'add_message':
-                # Add timestamp if not present
-                if 'timestamp' not in update_data:
-                    update_data['timestamp'] = time.time()
-                logger.debug(f"History server received message: {update_data.get('sender', '--')}: {update_data.get('message', '')[:50]}...")
-            
-            # Broadcast the event to clients
-            self.socketio.emit(event_type, update_data)
-            
+            self._process_update(request.get_json(cache=False))
             return jsonify({'status': 'success'})
         
         @self.socketio.on('connect')
         def handle_connect():
             """Send history to newly connected clients"""
-            logger.debug(f"Client connected to history server, sending {len(self.history_items)} history items")
+            logger.debug("Client connected to history server, sending %d history items", len(self.history_items))
             self.socketio.emit('restore_state', {
-                'conversation_history': self.history_items
+                'conversation_history': list(self.history_items)
             })
     
+    def ingest_batch(self, batch):
+        """Record and broadcast a batch of updates forwarded by the main server"""
+        for update_data in batch:
+            self._process_update(update_data)
+    
+    def _process_update(self, update_data):
+        """Record an update in the history and broadcast it to clients"""
+        event_type = update_data.get('event_type')
+        
+        # Store LLM interactions for history
+        if event_type == 'llm_interaction':
+            # Store with timestamp
+            if 'timestamp' not in update_data:
+                update_data['timestamp'] = time.time()
+
+            # Add to history, dropping the oldest item once full
+            self.history_items.append(update_data)
+
+            # Debug logging
+            logger.debug("History server received interaction: %s", update_data.get('step_title', '--'))
+            logger.debug("Prompt length: %d, Response length: %d", len(update_data.get('prompt', '')), len(update_data.get('response', '')))
+
+        # Store agent messages in history too
+        elif event_type == 'add_message':
+            # Add timestamp if not present
+            if 'timestamp' not in update_data:
+                update_data['timestamp'] = time.time()
+            logger.debug("History server received message: %s: %.50s...", update_data.get('sender', '--'), update_data.get('message', ''))
+
+        # Broadcast the event to clients
+        self.socketio.emit(event_type, update_data)
+    
     def run(self, port=HISTORY_PORT):
         """Run the Flask server"""
         # Disable Werkzeug access logs
@@ -178,21 +200,17 @@ class HistoryVisualizerApp:
         self.socketio.run(self.app, debug=False, host='0.0.0.0', port=port, allow_unsafe_werkzeug=True)
 
 
-def run_main_server(port, api_url, auto_start, history_port, auto_restart, server_ready_event):
+def run_main_server(port, api_url, auto_start, auto_restart, server_ready_event, history_app=None):
     """Run the main visualization server in a thread"""
-    global history_server_url
-    history_server_url = f"http://localhost:{history_port}"
-    
     logger.info(f"Starting main visualization server on http://localhost:{port}")
-    app = MainVisualizerApp(auto_restart=auto_restart)
+    app = MainVisualizerApp(auto_restart=auto_restart, history_app=history_app)
     server_ready_event.set()  # Signal that server is ready
     app.run(port=port, api_url=api_url, auto_start=auto_start)
 
 
-def run_history_server(port, server_ready_event):
+def run_history_server(port, server_ready_event, app):
     """Run the history server in a thread"""
     logger.info(f"Starting history visualization server on http://localhost:{port}")
-    app = HistoryVisualizerApp()
     server_ready_event.set()  # Signal that server is ready
     app.run(port=port)
 
@@ -260,13 +278,16 @@ def main():
     main_server_ready = threading.Event()
     history_server_ready = threading.Event()
     
-    # Start servers in separate threads
+    # The history app is built up front so a main server in this process can feed it directly
+    history_app = None if args.main_only else HistoryVisualizerApp()
+    
+    # Start servers in separate threads (green threads on one hub under eventlet)
     threads = []
     
     if not args.history_only:
         main_thread = threading.Thread(
             target=run_main_server,
-            args=(main_port, api_url, auto_start, history_port, auto_restart, main_server_ready),
+            args=(main_port, api_url, auto_start, auto_restart, main_server_ready, history_app),
             daemon=True
         )
         main_thread.start()
@@ -275,7 +296,7 @@ def main():
     if not args.main_only:
         history_thread = threading.Thread(
             target=run_history_server,
-            args=(history_port, history_server_ready),
+            args=(history_port, history_server_ready, history_app),
             daemon=True
         )
         history_thread.start()